@@ -1,29 +1,67 @@
 """Analysis API endpoints."""
 
 import uuid
-from datetime import datetime
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-import json
+from datetime import datetime, timezone
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+import orjson
+from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
 
 from app.api.schemas.request import AnalyzeRequest
-from app.api.schemas.response import (
-    DebateResponse,
-    AgentAnalysisResponse,
-    AgentArgumentResponse,
-    StockDataResponse,
-    HistoricalPriceResponse,
-    NewsItemResponse,
+from app.api.schemas.response import DebateResponse, StockDataResponse
+from app.core.graph.builder import debate_graph, stream_debate
+from app.core.graph.state import NEWS_ITEMS_ADAPTER, StreamUpdate, create_initial_state
+from app.services.stock_service import StockFields, format_ticker, get_stock_data
+from app.services.cache_service import stock_response_cache, ticker_tape_cache
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["analysis"],
+    default_response_class=ORJSONResponse,
 )
-from app.core.graph.builder import debate_graph
-from app.core.graph.state import create_initial_state
-from app.services.stock_service import format_ticker
 
-router = APIRouter(prefix="/api/v1", tags=["analysis"])
+# orjson options shared by every streamed event
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
 
+# Fields copied from internal state models into response payloads
+_STOCK_RESPONSE_FIELDS = frozenset(StockDataResponse.model_fields)
+_ANALYSIS_RESPONSE_FIELDS = frozenset(
+    {"agent_type", "summary", "arguments", "recommendation", "confidence_score", "timestamp"}
+)
+
+# SSE frame delimiters (frames are yielded as bytes to skip re-encoding;
+# EventSourceResponse passes bytes through untouched)
+_PREFIX = b"data: "
+_SUFFIX = b"\n\n"
+_COMPLETE_SSE = b'data: {"type":"complete"}\n\n'
+
+# Keep-alive comment interval so proxies don't drop slow debate rounds
+_SSE_PING_SECONDS = 15
+
+
+def _encode_sse_frame(update: StreamUpdate | BaseModel | dict) -> bytes:
+    """Encode one stream update as a complete SSE data frame."""
+    # Graph updates carry their JSON bytes from emission time
+    if type(update) is StreamUpdate:
+        return _PREFIX + update.to_json() + _SUFFIX
+    if isinstance(update, BaseModel):
+        payload = update.model_dump(mode="json", exclude_none=True)
+        return _PREFIX + orjson.dumps(payload) + _SUFFIX
+    return _PREFIX + orjson.dumps(update, option=_ORJSON_OPTS) + _SUFFIX
 
-@router.post("/analyze", response_model=DebateResponse)
-async def analyze_stock(request: AnalyzeRequest) -> DebateResponse:
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.post("/analyze", responses={200: {"model": DebateResponse}})
+async def analyze_stock(request: AnalyzeRequest) -> Response:
     """
     Initiate stock analysis debate (non-streaming).
 
@@ -50,82 +88,31 @@ async def analyze_stock(request: AnalyzeRequest) -> DebateResponse:
         if not final_state.get("moderator_analysis"):
             raise HTTPException(status_code=500, detail="Debate did not complete")
 
-        # Build response
+        # Build the DebateResponse payload straight from the already-validated
+        # state models; historical price rows pass through as plain dicts
         stock_data = final_state["stock_data"]
-        bull = final_state["bull_analysis"]
-        bear = final_state["bear_analysis"]
         moderator = final_state["moderator_analysis"]
 
-        return DebateResponse(
-            session_id=str(uuid.uuid4()),
-            ticker=ticker,
-            stock_data=StockDataResponse(
-                ticker=stock_data.ticker,
-                company_name=stock_data.company_name,
-                current_price=stock_data.current_price,
-                price_change_percent=stock_data.price_change_percent,
-                volume=stock_data.volume,
-                market_cap=stock_data.market_cap,
-                pe_ratio=stock_data.pe_ratio,
-                fifty_two_week_high=stock_data.fifty_two_week_high,
-                fifty_two_week_low=stock_data.fifty_two_week_low,
-                sector=stock_data.sector,
-                industry=stock_data.industry,
-                historical_prices=[
-                    HistoricalPriceResponse(**p) for p in stock_data.historical_prices
-                ],
-            ),
-            news_items=[
-                NewsItemResponse(
-                    title=n.title,
-                    snippet=n.snippet,
-                    source=n.source,
-                    url=n.url,
-                    date=n.date,
-                )
-                for n in final_state["news_items"]
-            ],
-            bull_analysis=AgentAnalysisResponse(
-                agent_type="bull",
-                summary=bull.summary,
-                arguments=[
-                    AgentArgumentResponse(
-                        point=a.point, evidence=a.evidence, confidence=a.confidence
-                    )
-                    for a in bull.arguments
-                ],
-                confidence_score=bull.confidence_score,
-                timestamp=bull.timestamp,
+        payload = {
+            "session_id": str(uuid.uuid4()),
+            "ticker": ticker,
+            "stock_data": stock_data.model_dump(include=_STOCK_RESPONSE_FIELDS),
+            "news_items": NEWS_ITEMS_ADAPTER.dump_python(final_state["news_items"]),
+            "bull_analysis": final_state["bull_analysis"].model_dump(
+                include=_ANALYSIS_RESPONSE_FIELDS
             ),
-            bear_analysis=AgentAnalysisResponse(
-                agent_type="bear",
-                summary=bear.summary,
-                arguments=[
-                    AgentArgumentResponse(
-                        point=a.point, evidence=a.evidence, confidence=a.confidence
-                    )
-                    for a in bear.arguments
-                ],
-                confidence_score=bear.confidence_score,
-                timestamp=bear.timestamp,
+            "bear_analysis": final_state["bear_analysis"].model_dump(
+                include=_ANALYSIS_RESPONSE_FIELDS
             ),
-            moderator_analysis=AgentAnalysisResponse(
-                agent_type="moderator",
-                summary=moderator.summary,
-                arguments=[
-                    AgentArgumentResponse(
-                        point=a.point, evidence=a.evidence, confidence=a.confidence
-                    )
-                    for a in moderator.arguments
-                ],
-                recommendation=moderator.recommendation,
-                confidence_score=moderator.confidence_score,
-                timestamp=moderator.timestamp,
+            "moderator_analysis": moderator.model_dump(
+                include=_ANALYSIS_RESPONSE_FIELDS
             ),
-            verdict=moderator.recommendation or "HOLD",
-            total_rounds=final_state.get("current_round", 1),
-            completed_at=datetime.utcnow(),
-        )
+            "verdict": moderator.recommendation or "HOLD",
+            "total_rounds": final_state.get("current_round", 1),
+            "completed_at": datetime.now(timezone.utc),
+        }
+
+        return Response(content=orjson.dumps(payload), media_type="application/json")
 
     except HTTPException:
         raise
@@ -153,70 +140,63 @@ async def analyze_stock_stream(request: AnalyzeRequest):
         """Generate SSE events from graph execution."""
         try:
             # Send start event
-            yield f"data: {json.dumps({'type': 'started', 'ticker': ticker})}\n\n"
-
-            # Stream graph execution
-            async for event in debate_graph.astream_events(initial_state, version="v2"):
-                event_kind = event.get("event")
-
-                if event_kind == "on_chain_end":
-                    output = event.get("data", {}).get("output", {})
-                    stream_updates = output.get("stream_updates", [])
+            yield _PREFIX + orjson.dumps({"type": "started", "ticker": ticker}) + _SUFFIX
 
-                    for update in stream_updates:
-                        if hasattr(update, "model_dump"):
-                            update_dict = update.model_dump()
-                        else:
-                            update_dict = update
-
-                        yield f"data: {json.dumps(update_dict)}\n\n"
+            # Stream graph execution, one frame per update as it is emitted;
+            # closing the stream (client gone) cancels the graph
+            async with aclosing(stream_debate(initial_state)) as updates:
+                async for update in updates:
+                    yield _encode_sse_frame(update)
 
             # Send complete event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield _COMPLETE_SSE
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield _PREFIX + orjson.dumps({"type": "error", "error": str(e)}) + _SUFFIX
 
-    return StreamingResponse(
+    # EventSourceResponse sets the no-cache / keep-alive headers itself and
+    # emits ping comments between events; proxy buffering is disabled
+    # explicitly so frames flush through nginx regardless of library version
+    return EventSourceResponse(
         event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        ping=_SSE_PING_SECONDS,
+        headers={"X-Accel-Buffering": "no"},
     )
 
 
-@router.get("/stock/{ticker}")
-async def get_stock_info(ticker: str, exchange: str = "NSE"):
+@router.get("/stock/{ticker}", responses={200: {"model": StockDataResponse}})
+async def get_stock_info(request: Request, ticker: str, exchange: str = "NSE"):
     """
     Quick endpoint to get stock data without debate.
-    """
-    from app.services.stock_service import get_stock_data
 
+    Responses are cached briefly per ticker and carry an ETag; a matching
+    If-None-Match returns 304 with no body.
+    """
     formatted_ticker = format_ticker(ticker, exchange)
 
     try:
-        data = await get_stock_data(formatted_ticker)
-        if data is None:
-            raise HTTPException(status_code=404, detail=f"Stock not found: {ticker}")
-
-        return StockDataResponse(
-            ticker=data.ticker,
-            company_name=data.company_name,
-            current_price=data.current_price,
-            price_change_percent=data.price_change_percent,
-            volume=data.volume,
-            market_cap=data.market_cap,
-            pe_ratio=data.pe_ratio,
-            fifty_two_week_high=data.fifty_two_week_high,
-            fifty_two_week_low=data.fifty_two_week_low,
-            sector=data.sector,
-            industry=data.industry,
-            historical_prices=[
-                HistoricalPriceResponse(**p) for p in data.historical_prices
-            ],
+        cached = stock_response_cache.get(formatted_ticker)
+        if cached is None:
+            # The response has no shareholding, analyst or financials
+            # fields, so skip those requests
+            data = await get_stock_data(formatted_ticker, fields=StockFields.PRICE)
+            if data is None:
+                raise HTTPException(status_code=404, detail=f"Stock not found: {ticker}")
+
+            # Serialize the StockDataResponse fields directly from StockData
+            cached = stock_response_cache.set(
+                formatted_ticker,
+                data.model_dump_json(include=_STOCK_RESPONSE_FIELDS).encode(),
+            )
+
+        body, etag = cached
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag},
         )
     except HTTPException:
         raise
@@ -230,6 +210,4 @@ async def get_ticker_tape_data():
     Get ticker tape data for major indices/stocks.
     Uses cached data (5-min TTL) to avoid Yahoo Finance rate limits.
     """
-    from app.services.cache_service import ticker_tape_cache
-
     return await ticker_tape_cache.get_ticker_tape_data()
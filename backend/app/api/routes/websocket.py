@@ -1,20 +1,31 @@
 """WebSocket endpoint for real-time debate streaming."""
 
-import json
 import uuid
+from contextlib import aclosing
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.api.schemas.request import TimeHorizon
-from app.core.graph.builder import debate_graph
-from app.core.graph.state import create_initial_state
+from app.core.graph.builder import stream_debate
+from app.core.graph.state import StreamUpdate, create_initial_state
 from app.services.stock_service import format_ticker
 
 router = APIRouter()
 
+# orjson options shared by every outgoing frame
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+# Static control frames, serialized once at import
+_PONG_FRAME = orjson.dumps({"type": "pong"}).decode()
+_COMPLETE_FRAME = orjson.dumps({"type": "complete", "message": "Debate complete"}).decode()
+_STOPPED_FRAME = orjson.dumps({"type": "stopped", "message": "Analysis stopped"}).decode()
+
 
 class ConnectionManager:
     """Manages WebSocket connections."""
 
+    __slots__ = ("active_connections",)
+
     def __init__(self):
         self.active_connections: dict[str, WebSocket] = {}
 
@@ -25,21 +36,34 @@ class ConnectionManager:
 
     def disconnect(self, session_id: str):
         """Remove connection."""
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
+        self.active_connections.pop(session_id, None)
 
     async def send_update(self, session_id: str, data: dict):
         """Send update to specific client."""
-        if session_id in self.active_connections:
-            try:
-                await self.active_connections[session_id].send_json(data)
-            except Exception:
-                self.disconnect(session_id)
+        await self.send_text(
+            session_id, orjson.dumps(data, option=_ORJSON_OPTS).decode()
+        )
+
+    async def send_text(self, session_id: str, text: str):
+        """Send an already-serialized JSON frame to specific client."""
+        websocket = self.active_connections.get(session_id)
+        if websocket is None:
+            return
+        try:
+            # Text frames: the client JSON.parse()s event.data directly
+            await websocket.send_text(text)
+        except Exception:
+            self.disconnect(session_id)
 
 
 manager = ConnectionManager()
 
 
+def _encode_update(update: StreamUpdate) -> str:
+    """Serialize a stream update to a JSON frame."""
+    return update.to_json().decode()
+
+
 @router.websocket("/ws/debate/{session_id}")
 async def websocket_debate(websocket: WebSocket, session_id: str):
     """
@@ -95,52 +119,24 @@ async def websocket_debate(websocket: WebSocket, session_id: str):
                     time_horizon=time_horizon,
                 )
 
-                # Stream graph execution
+                # Stream graph execution: updates are sent as the nodes emit
+                # them; leaving the stream early (client gone) cancels the graph
                 try:
-                    async for event in debate_graph.astream_events(
-                        initial_state, version="v2"
-                    ):
-                        event_kind = event.get("event")
-
-                        if event_kind == "on_chain_start":
-                            node_name = event.get("name", "")
-                            if node_name and not node_name.startswith("__"):
-                                await manager.send_update(
-                                    session_id,
-                                    {"type": "node_start", "node": node_name},
-                                )
-
-                        elif event_kind == "on_chain_end":
-                            output = event.get("data", {}).get("output", {})
-                            # Skip if output is not a dict (e.g., routing functions return strings)
-                            if not isinstance(output, dict):
-                                continue
-                            stream_updates = output.get("stream_updates", [])
-
-                            for update in stream_updates:
-                                if hasattr(update, "model_dump"):
-                                    update_dict = update.model_dump()
-                                else:
-                                    update_dict = update
-                                await manager.send_update(session_id, update_dict)
-
-                    # Send completion
-                    await manager.send_update(
-                        session_id, {"type": "complete", "message": "Debate complete"}
-                    )
-
+                    async with aclosing(stream_debate(initial_state)) as updates:
+                        async for update in updates:
+                            if session_id not in manager.active_connections:
+                                break
+                            await manager.send_text(session_id, _encode_update(update))
+                        else:
+                            await manager.send_text(session_id, _COMPLETE_FRAME)
                 except Exception as e:
-                    await manager.send_update(
-                        session_id, {"type": "error", "error": str(e)}
-                    )
+                    await manager.send_update(session_id, {"type": "error", "error": str(e)})
 
             elif data.get("type") == "ping":
-                await manager.send_update(session_id, {"type": "pong"})
+                await manager.send_text(session_id, _PONG_FRAME)
 
             elif data.get("type") == "stop":
-                await manager.send_update(
-                    session_id, {"type": "stopped", "message": "Analysis stopped"}
-                )
+                await manager.send_text(session_id, _STOPPED_FRAME)
                 break
 
     except WebSocketDisconnect:
@@ -1,8 +1,28 @@
 """Response schemas for InsightFlow API."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Shared Literal aliases (one type object each, reused across models)
+AgentType = Literal["bull", "bear", "moderator"]
+MarketSentiment = Literal["bullish", "bearish", "neutral"]
+StreamEventType = Literal[
+    "started",
+    "data_fetched",
+    "agent_start",
+    "agent_response",
+    "token",
+    "round_complete",
+    "error",
+    "complete",
+]
+
+
+def _utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
 
 
 class AgentArgumentResponse(BaseModel):
@@ -24,7 +44,7 @@ class SourceResponse(BaseModel):
 class AgentAnalysisResponse(BaseModel):
     """Complete analysis from an agent."""
 
-    agent_type: Literal["bull", "bear", "moderator"]
+    agent_type: AgentType
     summary: str = Field(..., description="Brief summary of the analysis")
     arguments: list[AgentArgumentResponse] = Field(default_factory=list)
     recommendation: str | None = Field(
@@ -33,18 +53,18 @@ class AgentAnalysisResponse(BaseModel):
     )
     confidence_score: float = Field(..., ge=0.0, le=1.0)
     sources: list[SourceResponse] = Field(default_factory=list, description="Data sources used in analysis")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 
-class HistoricalPriceResponse(BaseModel):
-    """Historical price data point."""
+class HistoricalPricesResponse(BaseModel):
+    """Historical price data as parallel columns (one entry per day)."""
 
-    date: str
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: int
+    date: list[str] = Field(default_factory=list)
+    open: list[float] = Field(default_factory=list)
+    high: list[float] = Field(default_factory=list)
+    low: list[float] = Field(default_factory=list)
+    close: list[float] = Field(default_factory=list)
+    volume: list[int] = Field(default_factory=list)
 
 
 class StockDataResponse(BaseModel):
@@ -61,7 +81,7 @@ class StockDataResponse(BaseModel):
     fifty_two_week_low: float
     sector: str | None = None
     industry: str | None = None
-    historical_prices: list[HistoricalPriceResponse] = Field(default_factory=list)
+    historical_prices: HistoricalPricesResponse = Field(default_factory=HistoricalPricesResponse)
 
 
 class NewsItemResponse(BaseModel):
@@ -100,13 +120,16 @@ class SummaryAnalysisResponse(BaseModel):
     stock_context: str = Field(..., description="2-3 sentence stock context")
     key_catalysts: list[str] = Field(default_factory=list, description="Key events affecting stock")
     top_headlines: list[TopHeadlineResponse] = Field(default_factory=list, description="Top 3 headlines")
-    market_sentiment: Literal["bullish", "bearish", "neutral"] = Field(default="neutral")
+    market_sentiment: MarketSentiment = Field(default="neutral")
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Summary confidence")
 
 
 class DebateResponse(BaseModel):
     """Complete debate response."""
 
+    # Only used for OpenAPI docs; build the schema on first use
+    model_config = ConfigDict(defer_build=True)
+
     session_id: str
     ticker: str
     stock_data: StockDataResponse
@@ -124,16 +147,10 @@ class DebateResponse(BaseModel):
 class StreamUpdateResponse(BaseModel):
     """Real-time stream update."""
 
-    type: Literal[
-        "started",
-        "data_fetched",
-        "agent_start",
-        "agent_response",
-        "token",
-        "round_complete",
-        "error",
-        "complete",
-    ]
+    # Only used for docs; build the schema on first use
+    model_config = ConfigDict(defer_build=True)
+
+    type: StreamEventType
     agent: str | None = None
     content: str | None = None
     analysis: AgentAnalysisResponse | None = None
@@ -149,4 +166,4 @@ class HealthResponse(BaseModel):
 
     status: str = "healthy"
     version: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
@@ -1,7 +1,7 @@
 """Configuration settings for InsightFlow backend."""
 
 import json
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
 
 
@@ -26,10 +26,27 @@ class Settings(BaseSettings):
     # Debate settings
     default_max_rounds: int = 1
     max_allowed_rounds: int = 3
+    # Run 1-round debates as one combined bull/bear/verdict LLM call
+    fused_single_round: bool = True
+    # Run the opening round's bull and bear cases in parallel (otherwise the
+    # bear rebuts the bull from round 1)
+    parallel_first_round: bool = True
+    # Send the moderator's verdict to clients as "token" updates while it
+    # is generated (the bundled frontend doesn't render them)
+    stream_tokens: bool = False
 
-    @property
+    # LLM response cache: enabled | read-only | replay | disabled
+    llm_cache_mode: str = "enabled"
+    llm_cache_path: str = ".llm_cache.sqlite3"
+    llm_cache_ttl_seconds: int = 900
+    llm_cache_max_entries: int = 1024
+
+    # Ticker tape snapshot shared by workers and restarts (empty to disable)
+    ticker_tape_snapshot_path: str = ".ticker_tape_cache.json"
+
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Parse CORS origins from JSON string."""
+        """Parse CORS origins from JSON string (once per settings instance)."""
         try:
             return json.loads(self.cors_origins)
         except json.JSONDecodeError:
@@ -41,7 +58,7 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
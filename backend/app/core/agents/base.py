@@ -1,22 +1,308 @@
 """Base agent configuration."""
 
 import os
+import re
+from collections.abc import AsyncIterator, Iterator
 from functools import lru_cache
-from crewai import LLM
+from typing import TYPE_CHECKING, TypeVar
+import orjson
+from pydantic import BaseModel, ValidationError
 
+from app.core.graph.state import StockData
 
-@lru_cache
-def get_llm() -> LLM:
+if TYPE_CHECKING:
+    from crewai import LLM
+    from openai import AsyncOpenAI
+
+
+# Where a JSON object can begin: "{" followed by a key or the closing brace.
+# Skips prose placeholders like "{sector}" without trying to parse them.
+_JSON_OBJECT_START = re.compile(r'\{\s*["}]')
+# Characters that matter while scanning for the matching close brace, and a
+# complete string literal (escapes included) to skip over in one match
+_JSON_STRUCTURE = re.compile(r'[{}"]')
+_JSON_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Shared LLM clients, created on first use so importing this module
+# doesn't load crewai
+_LLM: "LLM | None" = None
+_CREATIVE_LLM: "LLM | None" = None
+_ASYNC_CLIENT: "AsyncOpenAI | None" = None
+
+
+def get_llm() -> "LLM":
     """Get configured OpenAI LLM instance for CrewAI."""
-    return LLM(
-        model="gpt-4o-mini",
-        temperature=0.7,
-    )
+    global _LLM
+    if _LLM is None:
+        from crewai import LLM
+
+        _LLM = LLM(
+            model="gpt-4o-mini",
+            temperature=0.7,
+        )
+    return _LLM
 
 
-def get_creative_llm() -> LLM:
+def get_creative_llm() -> "LLM":
     """Get LLM with higher temperature for creative responses."""
-    return LLM(
-        model="gpt-4o-mini",
-        temperature=0.9,
+    global _CREATIVE_LLM
+    if _CREATIVE_LLM is None:
+        from crewai import LLM
+
+        _CREATIVE_LLM = LLM(
+            model="gpt-4o-mini",
+            temperature=0.9,
+        )
+    return _CREATIVE_LLM
+
+
+def get_async_client() -> "AsyncOpenAI":
+    """Get the shared async OpenAI client for direct streamed completions."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        from openai import AsyncOpenAI
+
+        _ASYNC_CLIENT = AsyncOpenAI()
+    return _ASYNC_CLIENT
+
+
+def _strict_schema_node(node: object) -> None:
+    """Rewrite a JSON schema in place to what OpenAI's strict mode accepts."""
+    if isinstance(node, dict):
+        # Strict mode requires every property and rejects unknown keys;
+        # defaults are applied by our own validation instead
+        node.pop("default", None)
+        if "properties" in node:
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+        for value in node.values():
+            _strict_schema_node(value)
+    elif isinstance(node, list):
+        for value in node:
+            _strict_schema_node(value)
+
+
+@lru_cache(maxsize=None)
+def json_schema_format(model: type[BaseModel]) -> dict:
+    """
+    Build the strict json_schema response_format for a response model.
+
+    Args:
+        model: Pydantic model the answer is validated against
+
+    Returns:
+        response_format value constraining generation to the model's schema
+    """
+    schema = model.model_json_schema()
+    _strict_schema_node(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": schema, "strict": True},
+    }
+
+
+def response_format(
+    json_mode: bool = False, response_model: type[BaseModel] | None = None
+) -> dict | None:
+    """
+    Pick the response_format for a completion, if any.
+
+    Args:
+        json_mode: Constrain the output to a single JSON object
+        response_model: Constrain the output to this model's JSON schema
+            (takes precedence over json_mode)
+
+    Returns:
+        response_format value, or None for free text
+    """
+    if response_model is not None:
+        return json_schema_format(response_model)
+    if json_mode:
+        return {"type": "json_object"}
+    return None
+
+
+async def stream_completion(
+    system_prompt: str,
+    prompt: str,
+    llm: "LLM",
+    json_mode: bool = False,
+    response_model: type[BaseModel] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion's text for a prompt, chunk by chunk.
+
+    Args:
+        system_prompt: Agent persona
+        prompt: Task prompt
+        llm: LLM whose model and temperature to use
+        json_mode: Constrain the output to a single JSON object
+        response_model: Constrain the output to this model's JSON schema
+            (takes precedence over json_mode)
+
+    Yields:
+        Text deltas as the model generates them
+    """
+    fmt = response_format(json_mode, response_model)
+    extra = {"response_format": fmt} if fmt is not None else {}
+    stream = await get_async_client().chat.completions.create(
+        model=llm.model,
+        temperature=llm.temperature,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ],
+        stream=True,
+        **extra,
     )
+    async for chunk in stream:
+        if chunk.choices and (delta := chunk.choices[0].delta.content):
+            yield delta
+
+
+# Stock-data prompt lines: (section, ((line format, attributes, always), ...)).
+# A line is emitted if it is marked always or one of its attributes is not
+# None, and a section only if it has lines, so "N/A" filler never reaches
+# the prompt.
+_STOCK_DATA_LAYOUT = (
+    ("CURRENT STOCK DATA", (
+        ("- Company: {}", ("display_name",), True),
+        ("- Current Price: Rs. {}", ("current_price",), True),
+        ("- Price Change: {:.2f}%", ("price_change_percent",), True),
+        ("- P/E Ratio: {}", ("pe_ratio",), False),
+        ("- P/B Ratio: {}", ("pb_ratio",), False),
+        ("- Market Cap: Rs. {}", ("market_cap",), False),
+        ("- 52-Week Range: Rs. {} - Rs. {}", ("fifty_two_week_low", "fifty_two_week_high"), False),
+        ("- Sector: {}", ("sector",), False),
+        ("- Industry: {}", ("industry",), False),
+    )),
+    ("FUNDAMENTALS", (
+        ("- EPS: Rs. {}", ("eps",), False),
+        ("- Book Value: Rs. {}", ("book_value",), False),
+        ("- Beta: {}", ("beta",), False),
+        ("- Dividend Yield: {}%", ("dividend_yield",), False),
+        ("- ROE: {}%", ("roe",), False),
+        ("- Debt/Equity: {}", ("debt_to_equity",), False),
+    )),
+    ("SHAREHOLDING", (
+        ("- Promoter Holding: {}%", ("promoter_holding",), False),
+        ("- Institutional Holding: {}%", ("fii_holding",), False),
+    )),
+    ("ANALYST CONSENSUS", (
+        ("- Buy: {}, Hold: {}, Sell: {}", ("analyst_buy", "analyst_hold", "analyst_sell"), False),
+        ("- Target Price: Rs. {}", ("target_price",), False),
+    )),
+    ("QUARTERLY PERFORMANCE", (
+        ("- Revenue: Rs. {}", ("quarterly_revenue",), False),
+        ("- Profit: Rs. {}", ("quarterly_profit",), False),
+        ("- Revenue Growth: {}%", ("revenue_growth",), False),
+        ("- Profit Growth: {}%", ("profit_growth",), False),
+    )),
+)
+
+
+def format_stock_data(stock_data: StockData) -> str:
+    """
+    Render the stock-data section shared by the debate task prompts.
+
+    Args:
+        stock_data: Stock market data
+
+    Returns:
+        Prompt text with fields that have no data left out
+    """
+    sections = []
+    for title, layout in _STOCK_DATA_LAYOUT:
+        lines = [f"{title}:"]
+        for line, attrs, always in layout:
+            values = [getattr(stock_data, attr) for attr in attrs]
+            # Zero is data (e.g. no sell ratings); only missing values are dropped
+            if always or any(value is not None for value in values):
+                lines.append(line.format(*values))
+        if len(lines) > 1:
+            sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def _balanced_object_end(text: str, start: int) -> int | None:
+    """Return the index just past the brace that closes the object at start."""
+    depth = 0
+    pos = start
+    # Jump between structural characters instead of stepping per character
+    while (match := _JSON_STRUCTURE.search(text, pos)) is not None:
+        ch = match.group()
+        if ch == '"':
+            string = _JSON_STRING.match(text, match.start())
+            if string is None:
+                return None
+            pos = string.end()
+            continue
+        pos = match.end()
+        if ch == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+    return None
+
+
+def iter_json_candidates(text: str) -> Iterator[str]:
+    """
+    Yield each brace-balanced object-like span embedded in LLM output.
+
+    Each candidate start is scanned to its balanced closing brace (ignoring
+    braces inside string literals), so prose and trailing text around the
+    object don't break parsing.
+
+    Args:
+        text: Raw LLM response text
+
+    Yields:
+        Candidate JSON object text, in order of appearance
+    """
+    for match in _JSON_OBJECT_START.finditer(text):
+        end = _balanced_object_end(text, match.start())
+        if end is not None:
+            yield text[match.start():end]
+
+
+def extract_json_object(text: str) -> dict | None:
+    """
+    Find and parse the first JSON object embedded in LLM output.
+
+    Args:
+        text: Raw LLM response text
+
+    Returns:
+        The parsed object, or None if no candidate parses as a JSON object
+    """
+    for candidate in iter_json_candidates(text):
+        try:
+            data = orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def extract_json_model(text: str, model: type[ModelT]) -> ModelT | None:
+    """
+    Validate the first embedded JSON object that fits a response model.
+
+    Args:
+        text: Raw LLM response text
+        model: Pydantic model describing the expected JSON
+
+    Returns:
+        The validated model, or None if no candidate validates
+    """
+    for candidate in iter_json_candidates(text):
+        try:
+            return model.model_validate_json(candidate)
+        except ValidationError:
+            continue
+    return None
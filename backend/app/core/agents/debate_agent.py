@@ -0,0 +1,451 @@
+"""Debate Agent - argues the bull or bear investment case."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from string import Template
+from typing import TYPE_CHECKING, Literal
+from app.core.agents.base import (
+    extract_json_object,
+    format_stock_data,
+    get_llm,
+)
+from app.core.agents.response_cache import execute_task_cached
+from app.core.graph.state import (
+    StockData,
+    NewsItem,
+    AgentAnalysis,
+    AgentArgument,
+    Source,
+)
+from app.api.schemas.request import TimeHorizon
+
+if TYPE_CHECKING:
+    from crewai import Agent
+
+logger = logging.getLogger(__name__)
+
+Stance = Literal["bull", "bear"]
+
+TIME_HORIZON_LABELS = {
+    TimeHorizon.SHORT_TERM: "Short-term (1-5 days)",
+    TimeHorizon.MEDIUM_TERM: "Medium-term (1-3 months)",
+    TimeHorizon.LONG_TERM: "Long-term (1+ year)",
+}
+
+TIME_HORIZON_FOCUS = {
+    TimeHorizon.SHORT_TERM: "momentum, recent news sentiment, technical patterns, and immediate catalysts",
+    TimeHorizon.MEDIUM_TERM: "quarterly results outlook, sector trends, technical support/resistance, and upcoming events",
+    TimeHorizon.LONG_TERM: "fundamental valuation, competitive moat, management quality, and long-term growth story",
+}
+
+# Every horizon must have a label and focus (lookups index directly)
+assert set(TIME_HORIZON_LABELS) == set(TIME_HORIZON_FOCUS) == set(TimeHorizon)
+
+BULLISH_KEYWORDS = (
+    'growth', 'surge', 'rally', 'profit', 'gain', 'up', 'rise', 'bullish', 'soar',
+    'strong', 'beat', 'exceed', 'positive', 'upgrade', 'buy', 'expansion', 'jump',
+    'breakthrough', 'success', 'record', 'high', 'boost', 'improve', 'recovery',
+    'outperform', 'momentum', 'opportunity', 'innovation', 'launch', 'partnership',
+    'revenue', 'earnings', 'dividend', 'invest', 'target', 'optimistic', 'bullish',
+    'upside', 'rebound', 'advancing', 'winning', 'favorable', 'strength',
+)
+
+BEARISH_KEYWORDS = (
+    'loss', 'fall', 'drop', 'decline', 'down', 'bearish', 'weak', 'miss', 'sink',
+    'concern', 'risk', 'negative', 'downgrade', 'sell', 'warning', 'trouble', 'slide',
+    'problem', 'crisis', 'crash', 'plunge', 'slump', 'cut', 'reduce', 'layoff',
+    'losses', 'volatility', 'pressure', 'threat', 'disappointing', 'worst',
+    'downturn', 'struggle', 'failing', 'uncertain', 'pessimistic',
+)
+
+# Task prompt templates shared by both stances
+TASK_TEMPLATE = Template(
+    """\
+Analyze $ticker and build a strong $case_label case for a $horizon_label outlook.
+
+TIME HORIZON: $horizon_label
+Focus your arguments on: $horizon_focus
+
+$stock_data
+
+RECENT NEWS:
+$news_summary
+$counter_context
+
+Provide your analysis in the following JSON format ONLY (no other text):
+$output_format
+
+CONFIDENCE GUIDELINES for $horizon_label:
+$confidence_guidelines
+
+$closing
+"""
+)
+
+COUNTER_TEMPLATE = Template(
+    """
+🎯 $opponent'S ARGUMENTS TO COUNTER (Round $round_number):
+Their thesis: $summary
+Their points: $points
+
+$counter_instruction
+"""
+)
+
+# Stance-specific persona, prompt wording and news-selection settings
+PERSONAS: dict[str, dict] = {
+    "bull": {
+        "label": "BULL AGENT",
+        "role": "Aggressive Bull Market Analyst & Bear Destroyer",
+        "goal": """DEMOLISH bearish arguments and prove why this stock is a screaming BUY.
+                   Expose the bear's fear-mongering, highlight their cherry-picked data,
+                   and show why pessimists will miss the boat. Be ruthless in your rebuttals.""",
+        "backstory": """You are an infamous bull analyst known for your savage takedowns of
+                        bearish arguments. You've made fortunes calling bottoms when bears were
+                        screaming doom. You DESPISE fear-mongering and lazy bear analysis.
+                        When a bear makes a weak argument, you don't just counter it - you
+                        HUMILIATE it with facts. You've been right on Infosys, HDFC Bank,
+                        Reliance when everyone else was scared. Bears hate you because you
+                        expose their intellectual laziness. You're not just bullish - you're
+                        a bear's worst nightmare. Indian market specialist (NSE/BSE).""",
+        "case_label": "BULLISH",
+        "opponent": "BEAR",
+        "counter_instruction": "Counter these points with strong evidence. Show why the bullish case is stronger for the $horizon_label timeframe.",
+        "output_format": """{
+    "summary": "2-3 sentence bullish thesis focused on the $horizon_label outlook. Be confident but substantive.",
+    "arguments": [
+        {"point": "Strong bullish argument for $horizon_label", "evidence": "Data supporting this view", "confidence": <0.6-0.95 based on evidence strength>},
+        {"point": "Another compelling point", "evidence": "Supporting facts", "confidence": <0.6-0.95>},
+        {"point": "Key catalyst or strength", "evidence": "Why this matters for $horizon_label", "confidence": <0.6-0.95>}
+    ],
+    "confidence_score": <YOUR HONEST ASSESSMENT 0.5-0.95 for the $horizon_label outlook>
+}""",
+        "confidence_guidelines": """\
+- 0.85+: Very strong bullish case for this timeframe
+- 0.70-0.84: Good bullish case, some uncertainties
+- 0.55-0.69: Moderately bullish, notable risks exist
+- Below 0.55: Weak bullish case for this timeframe""",
+        "closing": "Focus on factors most relevant to the $horizon_label investment horizon.",
+        "expected_output": "JSON formatted bullish analysis",
+        "default_summary": "Bullish analysis completed.",
+        # Fallback news when nothing leans our way: general market coverage
+        "fallback_words": ('stock', 'market', 'trading'),
+        "fallback_slice": slice(0, 5),
+    },
+    "bear": {
+        "label": "BEAR AGENT",
+        "role": "Ruthless Bear Analyst & Bull Slayer",
+        "goal": """EVISCERATE bullish arguments and expose why this stock is a TRAP.
+                   Tear apart the bull's hopium-fueled delusions with cold hard facts.
+                   Show why the optimists are bagholders-in-waiting.""",
+        "backstory": """You are the most feared bear analyst on Dalal Street. Bulls HATE you
+                        because you've saved countless investors from catastrophic losses while
+                        they were busy pumping garbage. You called the top on Yes Bank, DHFL,
+                        and countless other "growth stories" that turned into nightmares.
+                        When bulls make rosy projections, you expose the accounting tricks,
+                        the hidden debt, the insider selling they conveniently ignore.
+                        You don't just disagree with bulls - you DEMOLISH their fantasy with
+                        forensic analysis. Your motto: "Every bull case has holes, find them."
+                        Indian market specialist (NSE/BSE) who has seen every pump and dump.""",
+        "case_label": "BEARISH/CAUTIONARY",
+        "opponent": "BULL",
+        "counter_instruction": "Counter these points with evidence. Show the risks and concerns for the $horizon_label timeframe.",
+        "output_format": """{
+    "summary": "2-3 sentence bearish/cautionary thesis focused on the $horizon_label outlook. Highlight key risks.",
+    "arguments": [
+        {"point": "Key risk for $horizon_label", "evidence": "Data supporting this concern", "confidence": <0.6-0.95 based on evidence strength>},
+        {"point": "Another concern to consider", "evidence": "Supporting facts", "confidence": <0.6-0.95>},
+        {"point": "Potential headwind or challenge", "evidence": "Why this matters for $horizon_label", "confidence": <0.6-0.95>}
+    ],
+    "confidence_score": <YOUR HONEST ASSESSMENT 0.5-0.95 for the bearish case in $horizon_label>
+}""",
+        "confidence_guidelines": """\
+- 0.85+: Very strong bearish case for this timeframe
+- 0.70-0.84: Good bearish case, some positives exist
+- 0.55-0.69: Moderately bearish, bulls have valid points
+- Below 0.55: Weak bearish case for this timeframe""",
+        "closing": "Focus on risks and concerns most relevant to the $horizon_label investment horizon.",
+        "expected_output": "JSON formatted bearish analysis",
+        "default_summary": "Bearish analysis completed.",
+        # Fallback news when nothing leans our way: risk-related coverage,
+        # skipping the first 3 items so we don't cite the same as the bull
+        "fallback_words": ('risk', 'volatility', 'uncertainty', 'challenge', 'competition'),
+        "fallback_slice": slice(3, 8),
+    },
+}
+
+# Specialize the shared templates per stance once at import; the remaining
+# placeholders are per-call values
+for _persona in PERSONAS.values():
+    _persona["task_template"] = Template(TASK_TEMPLATE.safe_substitute(_persona))
+    _persona["counter_template"] = Template(COUNTER_TEMPLATE.safe_substitute(_persona))
+
+
+def _text(value: object, default: str = "") -> str:
+    """Return value if the LLM gave a string, else the default."""
+    return value if isinstance(value, str) else default
+
+
+class DebateAgent:
+    """Debate agent that argues the bull or bear investment case."""
+
+    __slots__ = ("stance", "persona", "llm", "agent")
+
+    def __init__(self, stance: Stance):
+        self.stance = stance
+        self.persona = PERSONAS[stance]
+        self.llm = get_llm()
+        self.agent = self._create_agent()
+
+    def _create_agent(self) -> "Agent":
+        """Create the CrewAI agent."""
+        from crewai import Agent
+        from app.tools.crewai_tools import get_search_tool, get_yfinance_tool
+
+        return Agent(
+            role=self.persona["role"],
+            goal=self.persona["goal"],
+            backstory=self.persona["backstory"],
+            tools=[get_yfinance_tool(), get_search_tool()],
+            llm=self.llm,
+            verbose=True,
+            allow_delegation=False,
+            max_iter=1,
+        )
+
+    def _is_aligned_news(self, item: NewsItem) -> bool:
+        """Determine if news item leans toward this agent's stance based on keywords."""
+        text = (item.title + ' ' + (item.snippet or '')).lower()
+
+        bullish_score = sum(1 for keyword in BULLISH_KEYWORDS if keyword in text)
+        bearish_score = sum(1 for keyword in BEARISH_KEYWORDS if keyword in text)
+
+        if self.stance == "bear":
+            bullish_score, bearish_score = bearish_score, bullish_score
+
+        # Require at least 1 keyword for our side and more than the other side
+        return bullish_score > 0 and bullish_score > bearish_score
+
+    def _build_sources(
+        self, stock_data: StockData, news_items: list[NewsItem]
+    ) -> list[Source]:
+        """Build list of sources used in analysis, filtering for stance-leaning news."""
+        label = self.persona["label"]
+        sources = [
+            Source.model_construct(
+                type="stock_data",
+                name="Yahoo Finance",
+                url=f"https://finance.yahoo.com/quote/{stock_data.ticker}",
+            )
+        ]
+
+        # Filter for news leaning our way
+        aligned_news = [item for item in news_items if self._is_aligned_news(item)]
+
+        logger.debug(
+            "[%s] Total news items: %d, Aligned filtered: %d",
+            label, len(news_items), len(aligned_news),
+        )
+
+        if not aligned_news:
+            fallback_words = self.persona["fallback_words"]
+            fallback_news = []
+            for item in news_items:
+                text = (item.title + ' ' + (item.snippet or '')).lower()
+                if any(word in text for word in fallback_words):
+                    fallback_news.append(item)
+            news_to_use = (
+                fallback_news[:5] if fallback_news else news_items[self.persona["fallback_slice"]]
+            )
+        else:
+            news_to_use = aligned_news[:5]  # Take top 5 aligned news
+
+        # First article per outlet with a valid URL, in order, up to 3
+        by_source: dict[str, NewsItem] = {}
+        for item in news_to_use:
+            if item.url and item.source:
+                by_source.setdefault(item.source, item)
+                if len(by_source) >= 3:
+                    break
+
+        sources.extend(
+            Source.model_construct(type="news", name=self._source_name(item), url=item.url)
+            for item in by_source.values()
+        )
+        logger.debug("[%s] Added %d news sources", label, len(by_source))
+        return sources
+
+    @staticmethod
+    def _source_name(item: NewsItem) -> str:
+        """Create a meaningful source name from the article."""
+        if not item.title:
+            return item.source
+        # Truncate title if too long
+        title_preview = item.title[:50] + "..." if len(item.title) > 50 else item.title
+        return f"{item.source}: {title_preview}"
+
+    async def analyze(
+        self,
+        stock_data: StockData,
+        news_items: list[NewsItem],
+        time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
+        opponent_analysis: AgentAnalysis | None = None,
+        round_number: int = 1,
+    ) -> AgentAnalysis:
+        """
+        Generate this agent's analysis for the stock.
+
+        Args:
+            stock_data: Stock market data
+            news_items: Recent news articles
+            time_horizon: Investment time horizon for the analysis
+            opponent_analysis: The other side's analysis to counter
+            round_number: Current debate round
+
+        Returns:
+            AgentAnalysis with this stance's arguments
+        """
+        description, sources = self.build_prompt(
+            stock_data, news_items, time_horizon, opponent_analysis, round_number
+        )
+
+        from crewai import Task
+
+        task = Task(
+            description=description,
+            agent=self.agent,
+            expected_output=self.persona["expected_output"],
+        )
+
+        result = await asyncio.to_thread(execute_task_cached, task, self.llm)
+        return self._parse_result(result, sources)
+
+    def build_prompt(
+        self,
+        stock_data: StockData,
+        news_items: list[NewsItem],
+        time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
+        opponent_analysis: AgentAnalysis | None = None,
+        round_number: int = 1,
+    ) -> tuple[str, list[Source]]:
+        """
+        Build this agent's task prompt and the sources it cites.
+
+        Args:
+            stock_data: Stock market data
+            news_items: Recent news articles
+            time_horizon: Investment time horizon for the analysis
+            opponent_analysis: The other side's analysis to counter
+            round_number: Current debate round
+
+        Returns:
+            Task description and the sources for the resulting analysis
+        """
+        persona = self.persona
+
+        # Focus the prompt on news leaning our way
+        aligned_news = [item for item in news_items if self._is_aligned_news(item)]
+        news_to_analyze = aligned_news if aligned_news else news_items
+
+        sources = self._build_sources(stock_data, news_items)
+        news_summary = self._format_news(news_to_analyze)
+
+        horizon_label = TIME_HORIZON_LABELS[time_horizon]
+        horizon_focus = TIME_HORIZON_FOCUS[time_horizon]
+
+        context = {
+            "ticker": stock_data.ticker,
+            "stock_data": format_stock_data(stock_data),
+            "horizon_label": horizon_label,
+            "horizon_focus": horizon_focus,
+            "news_summary": news_summary,
+            "counter_context": "",
+        }
+
+        if opponent_analysis:
+            context["counter_context"] = persona["counter_template"].substitute(
+                round_number=round_number,
+                summary=opponent_analysis.summary,
+                points=[arg.point for arg in opponent_analysis.arguments],
+                horizon_label=horizon_label,
+            )
+
+        return persona["task_template"].substitute(context), sources
+
+    def _format_news(self, news_items: list[NewsItem]) -> str:
+        """Format news items for prompt."""
+        if not news_items:
+            return "No recent news available. Focus analysis on price data, technical indicators, and market trends."
+
+        # Check if only fallback news item
+        if len(news_items) == 1 and news_items[0].source == "StockArena":
+            return "No recent news articles found. Base analysis on stock price data, historical performance, and market context."
+
+        return "\n".join(f"- {item.title} ({item.source})" for item in news_items[:3])
+
+    def analysis_from_data(
+        self, data: dict, sources: list[Source], timestamp: datetime
+    ) -> AgentAnalysis:
+        """
+        Build an AgentAnalysis from this stance's parsed JSON answer.
+
+        Raises:
+            ValueError: If a confidence value isn't numeric
+            TypeError: If a confidence value is null or not a number/string
+        """
+        # Values are checked/coerced/clamped here, so skip pydantic validation
+        return AgentAnalysis.model_construct(
+            agent_type=self.stance,
+            summary=_text(data.get("summary"), self.persona["default_summary"]),
+            arguments=[
+                AgentArgument.model_construct(
+                    point=_text(arg.get("point")),
+                    evidence=_text(arg.get("evidence")),
+                    confidence=min(max(float(arg.get("confidence", 0.7)), 0.0), 1.0),
+                )
+                for arg in data.get("arguments", [])
+            ],
+            confidence_score=min(max(float(data.get("confidence_score", 0.7)), 0.0), 1.0),
+            sources=sources,
+            timestamp=timestamp,
+        )
+
+    def _parse_result(self, result: str, sources: list[Source]) -> AgentAnalysis:
+        """Parse agent result to AgentAnalysis."""
+        # CrewAI usually hands back a str already; convert at most once
+        result_str = result if isinstance(result, str) else str(result)
+        now = datetime.now(timezone.utc)
+
+        try:
+            # Try to extract JSON from the result
+            data = extract_json_object(result_str)
+
+            if data is not None:
+                return self.analysis_from_data(data, sources, now)
+
+        except (ValueError, TypeError, KeyError):
+            pass
+
+        # Fallback parsing
+        return AgentAnalysis.model_construct(
+            agent_type=self.stance,
+            summary=result_str[:500] if result_str else "Analysis completed.",
+            arguments=[
+                AgentArgument.model_construct(
+                    point="See detailed analysis",
+                    evidence=result_str[:300],
+                    confidence=0.6,
+                )
+            ],
+            confidence_score=0.6,
+            sources=sources,
+            timestamp=now,
+        )
+
+
+@lru_cache(maxsize=2)
+def get_debate_agent(stance: Stance) -> DebateAgent:
+    """Get the shared DebateAgent for a stance (its CrewAI agent, tools and LLM are built once)."""
+    return DebateAgent(stance)
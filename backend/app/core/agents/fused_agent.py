@@ -0,0 +1,140 @@
+"""Fused Debate Agent - bull, bear and verdict in a single LLM call."""
+
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, ValidationError
+from app.core.agents.base import get_llm
+from app.core.agents.debate_agent import PERSONAS, get_debate_agent
+from app.core.agents.moderator_agent import (
+    MODERATOR_BACKSTORY,
+    MODERATOR_ROLE,
+    STATIC_PROMPT_BY_HORIZON,
+    ModeratorResponse,
+    get_moderator_agent,
+)
+from app.core.agents.response_cache import stream_completion_cached
+from app.core.graph.state import StockData, NewsItem, AgentAnalysis
+from app.api.schemas.request import TimeHorizon
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = (
+    "You are a panel of Indian market specialists (NSE/BSE): a bull analyst, "
+    "a bear analyst and an impartial moderator. Write each part in its own "
+    "voice, then answer with a single JSON object."
+)
+
+PART_TEMPLATE = """
+===== PART {number}: {title} =====
+You are {role}. {backstory}
+
+{task}
+"""
+
+CLOSING = """
+===== ANSWER FORMAT =====
+The moderator must judge the bull and bear analyses written in parts 1 and 2
+as if they came from independent analysts.
+
+Return ONLY one JSON object with exactly these keys:
+{"bull": <the JSON from part 1>, "bear": <the JSON from part 2>, "moderator": <the JSON from part 3>}
+"""
+
+
+class FusedResponse(BaseModel):
+    """Combined JSON answer for a fused single-round debate."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    bull: dict
+    bear: dict
+    moderator: ModeratorResponse
+
+
+class FusedDebateAgent:
+    """Runs a single-round debate (bull, bear, verdict) in one LLM call."""
+
+    __slots__ = ("llm",)
+
+    def __init__(self):
+        self.llm = get_llm()
+
+    async def debate(
+        self,
+        stock_data: StockData,
+        news_items: list[NewsItem],
+        time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
+    ) -> tuple[AgentAnalysis, AgentAnalysis, AgentAnalysis] | None:
+        """
+        Generate the bull case, bear case and verdict together.
+
+        Args:
+            stock_data: Stock market data
+            news_items: Recent news articles
+            time_horizon: Investment time horizon for the analysis
+
+        Returns:
+            (bull, bear, moderator) analyses, or None if the combined answer
+            doesn't parse (callers fall back to the separate agents)
+        """
+        bull_agent = get_debate_agent("bull")
+        bear_agent = get_debate_agent("bear")
+        bull_task, bull_sources = bull_agent.build_prompt(stock_data, news_items, time_horizon)
+        bear_task, bear_sources = bear_agent.build_prompt(stock_data, news_items, time_horizon)
+
+        prompt = "".join((
+            PART_TEMPLATE.format(
+                number=1,
+                title="BULL ANALYST",
+                role=PERSONAS["bull"]["role"],
+                backstory=PERSONAS["bull"]["backstory"],
+                task=bull_task,
+            ),
+            PART_TEMPLATE.format(
+                number=2,
+                title="BEAR ANALYST",
+                role=PERSONAS["bear"]["role"],
+                backstory=PERSONAS["bear"]["backstory"],
+                task=bear_task,
+            ),
+            PART_TEMPLATE.format(
+                number=3,
+                title="MODERATOR",
+                role=MODERATOR_ROLE,
+                backstory=MODERATOR_BACKSTORY,
+                task=STATIC_PROMPT_BY_HORIZON[time_horizon],
+            ),
+            CLOSING,
+        ))
+
+        chunks = [
+            chunk
+            async for chunk in stream_completion_cached(
+                SYSTEM_PROMPT, prompt, self.llm, json_mode=True
+            )
+        ]
+
+        now = datetime.now(timezone.utc)
+        try:
+            data = FusedResponse.model_validate_json("".join(chunks))
+            bull = bull_agent.analysis_from_data(data.bull, bull_sources, now)
+            bear = bear_agent.analysis_from_data(data.bear, bear_sources, now)
+            moderator_agent = get_moderator_agent()
+            moderator = moderator_agent.analysis_from_response(
+                data.moderator,
+                moderator_agent.combine_sources(stock_data, bull, bear),
+                now,
+            )
+        except (ValidationError, ValueError, TypeError, AttributeError) as e:
+            logger.debug("Error parsing result, falling back: %s", e)
+            return None
+
+        return bull, bear, moderator
+
+
+@lru_cache(maxsize=1)
+def get_fused_debate_agent() -> FusedDebateAgent:
+    """Get the shared FusedDebateAgent."""
+    return FusedDebateAgent()
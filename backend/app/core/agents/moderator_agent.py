@@ -1,9 +1,14 @@
 """Moderator Agent - synthesizes debate and provides verdict."""
 
-import json
-from datetime import datetime
-from crewai import Agent, Task
-from app.core.agents.base import get_llm
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from app.core.agents.base import extract_json_model, get_llm
+from app.core.agents.response_cache import stream_completion_cached
 from app.core.graph.state import (
     StockData,
     AgentAnalysis,
@@ -12,6 +17,8 @@ from app.core.graph.state import (
 )
 from app.api.schemas.request import TimeHorizon
 
+logger = logging.getLogger(__name__)
+
 
 TIME_HORIZON_LABELS = {
     TimeHorizon.SHORT_TERM: "Short-term (1-5 days)",
@@ -25,22 +32,123 @@ TIME_HORIZON_FOCUS = {
     TimeHorizon.LONG_TERM: "fundamental valuation, competitive moat, management quality, and long-term growth story",
 }
 
+# Every horizon must have a label and focus (lookups index directly)
+assert set(TIME_HORIZON_LABELS) == set(TIME_HORIZON_FOCUS) == set(TimeHorizon)
 
-class ModeratorAgent:
-    """Moderator agent that synthesizes both perspectives and provides verdict."""
 
-    def __init__(self):
-        self.llm = get_llm()
-        self.agent = self._create_agent()
+def _render_static_prefix(time_horizon: TimeHorizon) -> str:
+    """Render the stock-independent part of the moderator task for a horizon."""
+    horizon_label = TIME_HORIZON_LABELS[time_horizon]
+    horizon_focus = TIME_HORIZON_FOCUS[time_horizon]
+    return f"""
+            Synthesize the bull and bear debate on this stock for a {horizon_label} outlook.
+
+            IMPORTANT: This is SUGGESTIVE analysis only, NOT financial advice. Help the investor think through the trade-offs.
+
+            TIME HORIZON: {horizon_label}
+            For this timeframe, focus on: {horizon_focus}
 
-    def _create_agent(self) -> Agent:
-        """Create the CrewAI agent."""
-        return Agent(
-            role="Decisive Investment Analyst & Debate Judge",
-            goal="""Analyze bull and bear arguments objectively and determine which case is STRONGER
+            Analyze which case is STRONGER for the {horizon_label} timeframe and provide your verdict in JSON format ONLY:
+            {{
+                "summary": "3-4 sentences synthesizing both perspectives. Clearly state which case appears stronger for {horizon_label} and why.",
+                "arguments": [
+                    {{"point": "Key factor favoring bulls", "evidence": "How relevant is this for {horizon_label}?", "confidence": <0.5-0.95>}},
+                    {{"point": "Key factor favoring bears", "evidence": "How relevant is this for {horizon_label}?", "confidence": <0.5-0.95>}},
+                    {{"point": "Critical deciding factor", "evidence": "What tips the scales one way or the other?", "confidence": <0.5-0.95>}}
+                ],
+                "recommendation": "<PICK ONE: LOOKS BULLISH | LEANS BULLISH | MIXED SIGNALS | LEANS BEARISH | LOOKS BEARISH>",
+                "confidence_score": <0.5-0.95 based on clarity of the outlook>
+            }}
+
+            VERDICT GUIDELINES for {horizon_label}:
+            Use this decision framework based on confidence scores and argument strength:
+
+            - LOOKS BULLISH: Choose when bull confidence ≥75% and bull case clearly dominates. Strong positive catalysts with limited downside risks.
+            - LEANS BULLISH: Choose when bull confidence is 60-74% OR bull case is moderately stronger. More positives than negatives.
+            - MIXED SIGNALS: ONLY choose when both sides are genuinely equal strength (both 50-60% confidence) OR legitimate uncertainty exists. Don't default to this!
+            - LEANS BEARISH: Choose when bear confidence is 60-74% OR bear case is moderately stronger. More concerns than positives.
+            - LOOKS BEARISH: Choose when bear confidence ≥75% and bear case clearly dominates. Significant risks outweigh potential upside.
+
+            DECISION LOGIC:
+            1. Compare the bull and bear confidence scores given with each case below
+            2. Evaluate which arguments are more relevant to {horizon_label}
+            3. Consider stock fundamentals and analyst consensus
+            4. MAKE A CLEAR CALL - avoid defaulting to MIXED SIGNALS unless truly warranted
+            5. If one side is clearly stronger, say so confidently
+
+            NOTE: This is investment analysis - take a position based on the evidence. Only use MIXED SIGNALS when genuinely uncertain.
+"""
+
+
+# Rendered once per horizon so every verdict prompt on a horizon sends a
+# byte-identical prefix
+STATIC_PROMPT_BY_HORIZON: dict[TimeHorizon, str] = {
+    horizon: _render_static_prefix(horizon) for horizon in TimeHorizon
+}
+
+Verdict = Literal[
+    "LOOKS BULLISH",
+    "LEANS BULLISH",
+    "MIXED SIGNALS",
+    "LEANS BEARISH",
+    "LOOKS BEARISH",
+]
+_VALID_RECOMMENDATIONS = frozenset(Verdict.__args__)
+
+
+# A debate is decisive, and the verdict is read straight off the verdict
+# guidelines without an LLM call, when one side is at least this confident...
+FAST_VERDICT_MIN_CONFIDENCE = 0.75
+# ...and leads the other side by at least this much
+FAST_VERDICT_MIN_GAP = 0.25
+
+
+def decisive_verdict(bull_confidence: float, bear_confidence: float) -> Verdict | None:
+    """
+    Return the verdict for a clear-cut debate, or None if it needs judging.
+
+    Args:
+        bull_confidence: Bull's overall confidence score
+        bear_confidence: Bear's overall confidence score
+
+    Returns:
+        LOOKS BULLISH / LOOKS BEARISH when one side clearly dominates
+    """
+    if bull_confidence - bear_confidence >= FAST_VERDICT_MIN_GAP:
+        if bull_confidence >= FAST_VERDICT_MIN_CONFIDENCE:
+            return "LOOKS BULLISH"
+    elif bear_confidence - bull_confidence >= FAST_VERDICT_MIN_GAP:
+        if bear_confidence >= FAST_VERDICT_MIN_CONFIDENCE:
+            return "LOOKS BEARISH"
+    return None
+
+
+class ModeratorResponse(BaseModel):
+    """JSON verdict the moderator LLM is asked to return."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    summary: str = "Analysis completed."
+    arguments: list[AgentArgument] = Field(default_factory=list)
+    recommendation: Verdict = "MIXED SIGNALS"
+    confidence_score: float = 0.7
+
+    @field_validator("recommendation", mode="before")
+    @classmethod
+    def _default_unknown_verdict(cls, value: object) -> object:
+        """Map an off-list verdict to MIXED SIGNALS instead of failing the parse."""
+        logger.debug("Raw recommendation from LLM: %s", value)
+        if not isinstance(value, str) or value not in _VALID_RECOMMENDATIONS:
+            logger.debug("Invalid recommendation %r, defaulting to MIXED SIGNALS", value)
+            return "MIXED SIGNALS"
+        return value
+
+
+MODERATOR_ROLE = "Decisive Investment Analyst & Debate Judge"
+MODERATOR_GOAL = """Analyze bull and bear arguments objectively and determine which case is STRONGER
                    for the given time horizon. Provide a clear verdict - don't fence-sit unless
-                   truly uncertain. Your role is to weigh evidence and make a reasoned call.""",
-            backstory="""You are a respected investment analyst known for making clear, well-reasoned
+                   truly uncertain. Your role is to weigh evidence and make a reasoned call."""
+MODERATOR_BACKSTORY = """You are a respected investment analyst known for making clear, well-reasoned
                         calls on stocks. You've judged hundreds of bull vs bear debates on Dalal Street.
                         While you're balanced, you're NOT indecisive - when the evidence points one way,
                         you say so. You understand that investors need clarity, not wishy-washy "it could
@@ -49,15 +157,23 @@ class ModeratorAgent:
                         which is rare. Your track record speaks for itself: you called the IT sector recovery,
                         warned on overvalued IPOs, and spotted value in beaten-down financials. You don't
                         guess - you analyze deeply and commit to a view. Indian market specialist (NSE/BSE)
-                        with 15+ years calling stocks correctly.""",
-            tools=[],  # Moderator synthesizes existing info
-            llm=self.llm,
-            verbose=True,
-            allow_delegation=False,
-            max_iter=1,
-        )
+                        with 15+ years calling stocks correctly."""
+
+# System prompt for direct (streamed) completions, mirroring how CrewAI
+# presents the agent persona
+_SYSTEM_PROMPT = (
+    f"You are {MODERATOR_ROLE}. {MODERATOR_BACKSTORY}\n"
+    f"Your personal goal is: {MODERATOR_GOAL}"
+)
+
+
+class ModeratorAgent:
+    """Moderator agent that synthesizes both perspectives and provides verdict."""
+
+    def __init__(self):
+        self.llm = get_llm()
 
-    def _combine_sources(
+    def combine_sources(
         self,
         stock_data: StockData,
         bull_analysis: AgentAnalysis,
@@ -65,31 +181,38 @@ class ModeratorAgent:
     ) -> list[Source]:
         """Combine sources from both analyses, deduplicating."""
         sources = [
-            Source(
+            Source.model_construct(
                 type="stock_data",
                 name="Yahoo Finance",
                 url=f"https://finance.yahoo.com/quote/{stock_data.ticker}",
             )
         ]
         seen_urls = {sources[0].url}
-        for src in bull_analysis.sources + bear_analysis.sources:
+        seen_names = {sources[0].name}
+        for src in chain(bull_analysis.sources, bear_analysis.sources):
             if src.url and src.url not in seen_urls:
                 sources.append(src)
                 seen_urls.add(src.url)
-            elif not src.url and src.name not in [s.name for s in sources]:
+                seen_names.add(src.name)
+            elif not src.url and src.name not in seen_names:
                 sources.append(src)
+                seen_names.add(src.name)
         return sources
 
-    async def synthesize(
+    async def synthesize_stream(
         self,
         stock_data: StockData,
         bull_analysis: AgentAnalysis,
         bear_analysis: AgentAnalysis,
         time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
         debate_history: list[dict] | None = None,
-    ) -> AgentAnalysis:
+    ) -> AsyncIterator[str]:
         """
-        Synthesize bull and bear arguments into final verdict.
+        Stream the raw verdict text as the LLM generates it.
+
+        Calls the chat completion API directly (the moderator has no tools,
+        so CrewAI adds nothing here). Join the chunks and pass the text to
+        build_verdict() for the final AgentAnalysis.
 
         Args:
             stock_data: Stock market data
@@ -98,16 +221,40 @@ class ModeratorAgent:
             time_horizon: Investment time horizon for the analysis
             debate_history: Full debate history (for multi-round debates)
 
-        Returns:
-            AgentAnalysis with final verdict
+        Yields:
+            Text chunks of the verdict JSON
         """
-        sources = self._combine_sources(stock_data, bull_analysis, bear_analysis)
+        description = self._build_description(
+            stock_data, bull_analysis, bear_analysis, time_horizon, debate_history
+        )
+        async for chunk in stream_completion_cached(
+            _SYSTEM_PROMPT, description, self.llm, response_model=ModeratorResponse
+        ):
+            yield chunk
+
+    def build_verdict(
+        self,
+        result: str,
+        stock_data: StockData,
+        bull_analysis: AgentAnalysis,
+        bear_analysis: AgentAnalysis,
+    ) -> AgentAnalysis:
+        """Parse streamed verdict text into the final AgentAnalysis."""
+        sources = self.combine_sources(stock_data, bull_analysis, bear_analysis)
+        return self._parse_result(result, sources)
+
+    def _build_description(
+        self,
+        stock_data: StockData,
+        bull_analysis: AgentAnalysis,
+        bear_analysis: AgentAnalysis,
+        time_horizon: TimeHorizon,
+        debate_history: list[dict] | None,
+    ) -> str:
+        """Build the moderator task prompt."""
         bull_args = self._format_arguments(bull_analysis.arguments)
         bear_args = self._format_arguments(bear_analysis.arguments)
 
-        horizon_label = TIME_HORIZON_LABELS.get(time_horizon, "Medium-term (1-3 months)")
-        horizon_focus = TIME_HORIZON_FOCUS.get(time_horizon, "overall investment merit")
-
         history_context = ""
         if debate_history and len(debate_history) > 2:
             history_context = f"""
@@ -115,18 +262,13 @@ class ModeratorAgent:
             DEBATE HISTORY:
             This was a {len(debate_history) // 2}-round debate with multiple exchanges.
             Consider the evolution of arguments across rounds.
+{self._compact_history(debate_history, bull_analysis, bear_analysis)}
             """
 
-        task = Task(
-            description=f"""
-            Synthesize the bull and bear debate on {stock_data.ticker} for a {horizon_label} outlook.
-
-            IMPORTANT: This is SUGGESTIVE analysis only, NOT financial advice. Help the investor think through the trade-offs.
-
-            TIME HORIZON: {horizon_label}
-            For this timeframe, focus on: {horizon_focus}
-
-            STOCK OVERVIEW:
+        # Static per-horizon instructions first, per-stock data last: the
+        # provider's prompt cache matches on the longest shared prefix
+        return STATIC_PROMPT_BY_HORIZON[time_horizon] + f"""
+            STOCK OVERVIEW ({stock_data.ticker}):
             - Company: {stock_data.company_name or stock_data.ticker}
             - Current Price: Rs. {stock_data.current_price}
             - Price Change: {stock_data.price_change_percent:.2f}%
@@ -148,111 +290,162 @@ class ModeratorAgent:
             Key points:
             {bear_args}
             {history_context}
+            """
 
-            Analyze which case is STRONGER for the {horizon_label} timeframe and provide your verdict in JSON format ONLY:
-            {{
-                "summary": "3-4 sentences synthesizing both perspectives. Clearly state which case appears stronger for {horizon_label} and why.",
-                "arguments": [
-                    {{"point": "Key factor favoring bulls", "evidence": "How relevant is this for {horizon_label}?", "confidence": <0.5-0.95>}},
-                    {{"point": "Key factor favoring bears", "evidence": "How relevant is this for {horizon_label}?", "confidence": <0.5-0.95>}},
-                    {{"point": "Critical deciding factor", "evidence": "What tips the scales one way or the other?", "confidence": <0.5-0.95>}}
-                ],
-                "recommendation": "<PICK ONE: LOOKS BULLISH | LEANS BULLISH | MIXED SIGNALS | LEANS BEARISH | LOOKS BEARISH>",
-                "confidence_score": <0.5-0.95 based on clarity of the outlook>
-            }}
+    def fast_verdict(
+        self,
+        stock_data: StockData,
+        bull_analysis: AgentAnalysis,
+        bear_analysis: AgentAnalysis,
+        time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
+    ) -> AgentAnalysis | None:
+        """
+        Build the verdict for a clear-cut debate without calling the LLM.
 
-            VERDICT GUIDELINES for {horizon_label}:
-            Use this decision framework based on confidence scores and argument strength:
+        Args:
+            stock_data: Stock market data
+            bull_analysis: Bull's final analysis
+            bear_analysis: Bear's final analysis
+            time_horizon: Investment time horizon for the analysis
 
-            - LOOKS BULLISH: Choose when bull confidence ≥75% and bull case clearly dominates. Strong positive catalysts with limited downside risks.
-            - LEANS BULLISH: Choose when bull confidence is 60-74% OR bull case is moderately stronger. More positives than negatives.
-            - MIXED SIGNALS: ONLY choose when both sides are genuinely equal strength (both 50-60% confidence) OR legitimate uncertainty exists. Don't default to this!
-            - LEANS BEARISH: Choose when bear confidence is 60-74% OR bear case is moderately stronger. More concerns than positives.
-            - LOOKS BEARISH: Choose when bear confidence ≥75% and bear case clearly dominates. Significant risks outweigh potential upside.
+        Returns:
+            AgentAnalysis with the verdict, or None if the debate is close
+        """
+        recommendation = decisive_verdict(
+            bull_analysis.confidence_score, bear_analysis.confidence_score
+        )
+        if recommendation is None:
+            return None
+
+        if recommendation == "LOOKS BULLISH":
+            winner, loser, side = bull_analysis, bear_analysis, "bull"
+        else:
+            winner, loser, side = bear_analysis, bull_analysis, "bear"
+
+        summary = (
+            f"The {side} case ({winner.confidence_score:.0%} confidence) clearly outweighs "
+            f"the other side ({loser.confidence_score:.0%}) for the "
+            f"{TIME_HORIZON_LABELS[time_horizon]} outlook. {winner.summary} "
+            f"Main counterpoint: {loser.summary}"
+        )
 
-            DECISION LOGIC:
-            1. Compare bull confidence ({bull_analysis.confidence_score:.0%}) vs bear confidence ({bear_analysis.confidence_score:.0%})
-            2. Evaluate which arguments are more relevant to {horizon_label}
-            3. Consider stock fundamentals and analyst consensus
-            4. MAKE A CLEAR CALL - avoid defaulting to MIXED SIGNALS unless truly warranted
-            5. If one side is clearly stronger, say so confidently
+        # The strongest point from each side, the winner's first
+        arguments = [
+            max(analysis.arguments, key=lambda arg: arg.confidence)
+            for analysis in (winner, loser)
+            if analysis.arguments
+        ]
 
-            NOTE: This is investment analysis - take a position based on the evidence. Only use MIXED SIGNALS when genuinely uncertain.
-            """,
-            agent=self.agent,
-            expected_output="JSON formatted suggestive analysis with outlook",
+        return AgentAnalysis.model_construct(
+            agent_type="moderator",
+            summary=summary,
+            arguments=arguments,
+            recommendation=recommendation,
+            confidence_score=winner.confidence_score,
+            sources=self.combine_sources(stock_data, bull_analysis, bear_analysis),
         )
 
-        result = task.execute_sync()
-        return self._parse_result(result, sources)
+    @staticmethod
+    def _compact_history(
+        debate_history: list[dict],
+        bull_analysis: AgentAnalysis,
+        bear_analysis: AgentAnalysis,
+    ) -> str:
+        """
+        Summarize earlier rounds' points for the prompt, compactly.
+
+        The final round is already in the prompt in full. Of the earlier
+        rounds, only the first and the one before the final are listed
+        (middle rounds collapse into one line), and a point is shown only
+        the first time it appears.
+        """
+        # Points already shown with the final cases are skipped
+        seen = {
+            (arg.point, arg.evidence)
+            for arg in chain(bull_analysis.arguments, bear_analysis.arguments)
+        }
+
+        rounds = sorted({
+            entry["round"] for entry in debate_history if isinstance(entry["round"], int)
+        })[:-1]
+        omitted = 0
+        if len(rounds) > 2:
+            omitted = len(rounds) - 2
+            rounds = [rounds[0], rounds[-1]]
+
+        lines = []
+        for round_number in rounds:
+            for entry in debate_history:
+                if entry["round"] != round_number:
+                    continue
+                points = []
+                for arg in entry["content"]["arguments"]:
+                    key = (arg["point"], arg["evidence"])
+                    if key not in seen:
+                        seen.add(key)
+                        points.append(arg["point"])
+                if points:
+                    lines.append(
+                        f"            Round {round_number} {entry['role']}: " + "; ".join(points)
+                    )
+            if omitted and round_number == rounds[0]:
+                lines.append(f"            ({omitted} middle round(s) omitted)")
+
+        return "\n".join(lines)
 
     def _format_arguments(self, arguments: list[AgentArgument]) -> str:
         """Format arguments for prompt."""
         return "\n".join(
-            [
-                f"  - {arg.point} (Evidence: {arg.evidence}, Confidence: {arg.confidence:.0%})"
-                for arg in arguments
-            ]
+            f"  - {arg.point} (Evidence: {arg.evidence}, Confidence: {arg.confidence:.0%})"
+            for arg in arguments
+        )
+
+    def analysis_from_response(
+        self, data: ModeratorResponse, sources: list[Source], timestamp: datetime
+    ) -> AgentAnalysis:
+        """
+        Build the verdict AgentAnalysis from a validated moderator answer.
+
+        The answer's fields were validated when it was parsed, so the
+        analysis is constructed without a second validation pass.
+        """
+        return AgentAnalysis.model_construct(
+            agent_type="moderator",
+            summary=data.summary,
+            arguments=data.arguments,
+            recommendation=data.recommendation,
+            confidence_score=min(max(data.confidence_score, 0.0), 1.0),
+            sources=sources,
+            timestamp=timestamp,
         )
 
     def _parse_result(self, result: str, sources: list[Source]) -> AgentAnalysis:
         """Parse agent result to AgentAnalysis."""
+        now = datetime.now(timezone.utc)
+
         try:
-            result_str = str(result)
-
-            start_idx = result_str.find("{")
-            end_idx = result_str.rfind("}") + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = result_str[start_idx:end_idx]
-                data = json.loads(json_str)
-
-                recommendation = data.get("recommendation", "MIXED SIGNALS")
-                # Validate recommendation - new suggestive format
-                valid_recommendations = [
-                    "LOOKS BULLISH",
-                    "LEANS BULLISH",
-                    "MIXED SIGNALS",
-                    "LEANS BEARISH",
-                    "LOOKS BEARISH",
-                ]
-
-                print(f"[MODERATOR] Raw recommendation from LLM: {recommendation}")
-
-                if recommendation not in valid_recommendations:
-                    print(f"[MODERATOR] Invalid recommendation '{recommendation}', defaulting to MIXED SIGNALS")
-                    recommendation = "MIXED SIGNALS"
-                else:
-                    print(f"[MODERATOR] Valid recommendation: {recommendation}")
-
-                return AgentAnalysis(
-                    agent_type="moderator",
-                    summary=data.get("summary", "Analysis completed."),
-                    arguments=[
-                        AgentArgument(
-                            point=arg.get("point", ""),
-                            evidence=arg.get("evidence", ""),
-                            confidence=float(arg.get("confidence", 0.7)),
-                        )
-                        for arg in data.get("arguments", [])
-                    ],
-                    recommendation=recommendation,
-                    confidence_score=float(data.get("confidence_score", 0.7)),
-                    sources=sources,
-                    timestamp=datetime.utcnow(),
-                )
-
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"[MODERATOR] Error parsing result: {e}")
-            print(f"[MODERATOR] Result snippet: {result[:200] if result else 'None'}")
-
-        print("[MODERATOR] Fallback to MIXED SIGNALS due to parsing error")
-        return AgentAnalysis(
+            # Validate the first embedded JSON object straight from its text
+            data = extract_json_model(str(result), ModeratorResponse)
+
+            if data is not None:
+                return self.analysis_from_response(data, sources, now)
+
+        except (ValueError, KeyError) as e:
+            logger.debug("Error parsing result: %s", e)
+
+        logger.debug("Fallback to MIXED SIGNALS, result snippet: %.200s", result)
+        return AgentAnalysis.model_construct(
             agent_type="moderator",
             summary=str(result)[:500] if result else "Analysis completed.",
             arguments=[],
             recommendation="MIXED SIGNALS",
             confidence_score=0.5,
             sources=sources,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
         )
+
+
+@lru_cache(maxsize=1)
+def get_moderator_agent() -> ModeratorAgent:
+    """Get the shared ModeratorAgent (its LLM is built once)."""
+    return ModeratorAgent()
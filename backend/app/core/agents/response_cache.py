@@ -0,0 +1,209 @@
+"""Persistent cache for LLM task responses."""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.agents.base import response_format, stream_completion
+
+# Cache policies (LLM_CACHE_MODE):
+#   enabled   - read hits, call the LLM on misses and store the result
+#   read-only - read hits, call the LLM on misses but never store
+#   replay    - read hits only; a miss is an error, the LLM is never called
+#   disabled  - bypass the cache entirely
+CACHE_MODES = frozenset({"enabled", "read-only", "replay", "disabled"})
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+
+def cache_key(
+    system_prompt: str,
+    prompt: str,
+    model: str,
+    temperature: float | None,
+    output_format: Any = None,
+) -> str:
+    """
+    Build the deterministic cache key for everything that shapes a reply.
+
+    The inputs are hashed as one JSON array, so no two distinct input sets
+    can run together into the same key.
+
+    Args:
+        system_prompt: Agent persona
+        prompt: Task prompt
+        model: LLM model name
+        temperature: Sampling temperature
+        output_format: response_format or expected-output spec, if any
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = orjson.dumps(
+        [system_prompt, prompt, model, temperature, output_format],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed key/value store of raw LLM responses with TTL and size bound."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "enabled",
+        ttl_seconds: int = 900,
+        max_entries: int = 1024,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode!r}")
+        self.mode = mode
+        self._path = path
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for a key, or None if missing/expired."""
+        if self.mode == "disabled":
+            return None
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        # Replay mode serves recordings regardless of age
+        if self.mode != "replay" and time.time() - stored_at > self._ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response (only in enabled mode)."""
+        if self.mode != "enabled":
+            return
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop the oldest entries beyond the size limit."""
+        conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+
+
+def execute_task_cached(task: Any, llm: Any) -> str:
+    """
+    Run a CrewAI task through the response cache.
+
+    Args:
+        task: CrewAI Task whose description is the full prompt
+        llm: LLM the task's agent runs on
+
+    Returns:
+        Raw response text, from the cache or a live LLM call
+    """
+    agent = task.agent
+    persona = f"{agent.role}\n{agent.goal}\n{agent.backstory}" if agent else ""
+    key = cache_key(
+        persona, task.description, llm.model, llm.temperature, task.expected_output
+    )
+
+    cached = llm_response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if llm_response_cache.mode == "replay":
+        raise LLMCacheMiss(f"No recorded LLM response for key {key[:12]}")
+
+    result = str(task.execute_sync())
+    llm_response_cache.set(key, result)
+    return result
+
+
+async def stream_completion_cached(
+    system_prompt: str,
+    prompt: str,
+    llm: Any,
+    json_mode: bool = False,
+    response_model: type[BaseModel] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a direct completion through the response cache.
+
+    A hit is yielded as a single chunk; a miss streams from the LLM and
+    stores the joined text once the stream ends.
+
+    Args:
+        system_prompt: Agent persona
+        prompt: Task prompt
+        llm: LLM whose model and temperature to use
+        json_mode: Constrain the output to a single JSON object
+        response_model: Constrain the output to this model's JSON schema
+
+    Yields:
+        Response text chunks
+    """
+    key = cache_key(
+        system_prompt,
+        prompt,
+        llm.model,
+        llm.temperature,
+        response_format(json_mode, response_model),
+    )
+
+    cached = await asyncio.to_thread(llm_response_cache.get, key)
+    if cached is not None:
+        yield cached
+        return
+
+    if llm_response_cache.mode == "replay":
+        raise LLMCacheMiss(f"No recorded LLM response for key {key[:12]}")
+
+    chunks = []
+    async for chunk in stream_completion(
+        system_prompt, prompt, llm, json_mode, response_model
+    ):
+        chunks.append(chunk)
+        yield chunk
+    await asyncio.to_thread(llm_response_cache.set, key, "".join(chunks))
+
+
+# Global cache instance
+llm_response_cache = LLMResponseCache(
+    path=settings.llm_cache_path,
+    mode=settings.llm_cache_mode,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    max_entries=settings.llm_cache_max_entries,
+)
@@ -1,37 +1,69 @@
 """Summary Agent - generates market + stock context overview."""
 
-import json
-from datetime import datetime
-from crewai import Agent, Task
-from app.core.agents.base import get_llm
-from app.core.graph.state import StockData, NewsItem
+import logging
+from collections.abc import Iterator
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from app.api.schemas.response import MarketSentiment
+from app.core.agents.base import extract_json_model, get_llm
+from app.core.agents.response_cache import stream_completion_cached
+from app.core.graph.state import StockData, NewsItem, TopHeadline
 
+logger = logging.getLogger(__name__)
 
-class SummaryAgent:
-    """Summary agent that provides market + stock context."""
+_VALID_SENTIMENTS = frozenset(MarketSentiment.__args__)
 
-    def __init__(self):
-        self.llm = get_llm()
-        self.agent = self._create_agent()
 
-    def _create_agent(self) -> Agent:
-        """Create the CrewAI agent."""
-        return Agent(
-            role="Market Intelligence Analyst & Context Provider",
-            goal="""Provide clear, concise summary of both the specific stock's situation
+class SummaryResponse(BaseModel):
+    """JSON summary the summary LLM is asked to return."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    market_overview: str = "Market analysis in progress."
+    stock_context: str | None = None
+    key_catalysts: list[str] = Field(default_factory=list)
+    top_headlines: list[TopHeadline] = Field(default_factory=list)
+    market_sentiment: MarketSentiment = "neutral"
+    confidence_score: float = 0.7
+
+    @field_validator("key_catalysts", "top_headlines", mode="before")
+    @classmethod
+    def _list_or_empty(cls, value: object) -> object:
+        """Treat a non-list value as no items."""
+        return value if isinstance(value, list) else []
+
+    @field_validator("market_sentiment", mode="before")
+    @classmethod
+    def _normalize_sentiment(cls, value: object) -> object:
+        """Lower-case the sentiment and map unknown values to neutral."""
+        if isinstance(value, str) and (sentiment := value.lower()) in _VALID_SENTIMENTS:
+            return sentiment
+        return "neutral"
+
+
+SUMMARY_ROLE = "Market Intelligence Analyst & Context Provider"
+SUMMARY_GOAL = """Provide clear, concise summary of both the specific stock's situation
                    and broader market context. Help investors understand if the stock's
-                   movement is stock-specific or market-driven.""",
-            backstory="""You are an experienced market analyst who excels at connecting
+                   movement is stock-specific or market-driven."""
+SUMMARY_BACKSTORY = """You are an experienced market analyst who excels at connecting
                         dots between individual stocks and market trends. You provide
                         executive summaries that busy investors can scan in 30 seconds.
                         You're known for identifying key catalysts and cutting through noise
-                        to highlight what really matters for investment decisions.""",
-            tools=[],
-            llm=self.llm,
-            verbose=True,
-            allow_delegation=False,
-            max_iter=1,
-        )
+                        to highlight what really matters for investment decisions."""
+
+_SYSTEM_PROMPT = (
+    f"You are {SUMMARY_ROLE}. {SUMMARY_BACKSTORY}\n"
+    f"Your personal goal is: {SUMMARY_GOAL}"
+)
+
+
+class SummaryAgent:
+    """Summary agent that provides market + stock context."""
+
+    __slots__ = ("llm",)
+
+    def __init__(self):
+        self.llm = get_llm()
 
     async def generate_summary(
         self,
@@ -56,22 +88,10 @@ class SummaryAgent:
         # Format top news
         news_text = self._format_news(news_items[:10])
 
-        # Build prompt
-        task = Task(
-            description=f"""
-            Analyze the market and stock situation for Indian markets:
-
-            MARKET INDICES TODAY:
-            {indices_text}
-
-            STOCK: {stock_data.ticker} - {stock_data.company_name or 'Company'}
-            Current Price: Rs. {stock_data.current_price:.2f} ({stock_data.price_change_percent:+.2f}%)
-            Sector: {stock_data.sector or 'N/A'}
-            P/E Ratio: {stock_data.pe_ratio or 'N/A'}
-            Market Cap: Rs. {stock_data.market_cap or 'N/A'}
-
-            RECENT NEWS (Top 10):
-            {news_text}
+        # Build prompt: static instructions first, live market/stock data
+        # last, so the provider's prompt cache can reuse the shared prefix
+        prompt = f"""
+            Analyze the market and stock situation for Indian markets using the data below.
 
             TASK:
             Provide a concise executive summary in JSON format with these fields:
@@ -106,26 +126,40 @@ class SummaryAgent:
 
             Focus on connecting stock performance to broader market trends. Be direct and actionable.
             Return ONLY valid JSON, no additional text.
-            """,
-            agent=self.agent,
-            expected_output="JSON formatted market + stock summary",
-        )
 
-        result = task.execute_sync()
-        return self._parse_result(result, stock_data.ticker)
+            MARKET INDICES TODAY:
+            {indices_text}
+
+            STOCK: {stock_data.ticker} - {stock_data.company_name or 'Company'}
+            Current Price: Rs. {stock_data.current_price:.2f} ({stock_data.price_change_percent:+.2f}%)
+            Sector: {stock_data.sector or 'N/A'}
+            P/E Ratio: {stock_data.pe_ratio or 'N/A'}
+            Market Cap: Rs. {stock_data.market_cap or 'N/A'}
+
+            RECENT NEWS (Top 10):
+            {news_text}
+            """
+
+        # The summary agent has no tools, so it calls the completion API
+        # directly with the answer constrained to the SummaryResponse schema
+        chunks = [
+            chunk
+            async for chunk in stream_completion_cached(
+                _SYSTEM_PROMPT, prompt, self.llm, response_model=SummaryResponse
+            )
+        ]
+        return self._parse_result("".join(chunks), stock_data.ticker)
 
     def _format_market_indices(self, indices: list[dict]) -> str:
         """Format market indices for prompt."""
         if not indices:
             return "Market data unavailable"
 
-        lines = []
-        for idx in indices:
-            sign = '+' if idx['change'] >= 0 else ''
-            lines.append(
-                f"- {idx['name']}: {idx['value']:.2f} ({sign}{idx['change_percent']:.2f}%)"
-            )
-        return '\n'.join(lines)
+        return '\n'.join(
+            f"- {idx['name']}: {idx['value']:.2f} "
+            f"({'+' if idx['change'] >= 0 else ''}{idx['change_percent']:.2f}%)"
+            for idx in indices
+        )
 
     def _format_news(self, news_items: list[NewsItem]) -> str:
         """Format news items for prompt."""
@@ -136,57 +170,39 @@ class SummaryAgent:
         if len(news_items) == 1 and news_items[0].source == "StockArena":
             return "No recent news articles found - analysis will be based on stock price data, technical indicators, and market context only"
 
-        lines = []
+        return '\n'.join(self._news_lines(news_items))
+
+    @staticmethod
+    def _news_lines(news_items: list[NewsItem]) -> Iterator[str]:
+        """Yield the numbered title line and snippet line for each item."""
         for i, item in enumerate(news_items, 1):
-            lines.append(f"{i}. {item.title} ({item.source})")
+            yield f"{i}. {item.title} ({item.source})"
             if item.snippet:
-                lines.append(f"   {item.snippet[:150]}...")
-        return '\n'.join(lines)
+                yield f"   {item.snippet[:150]}..."
 
     def _parse_result(self, result: str, ticker: str) -> dict:
         """Parse agent result to structured dict."""
         try:
-            result_str = str(result)
-
-            # Extract JSON from result
-            start_idx = result_str.find('{')
-            end_idx = result_str.rfind('}') + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = result_str[start_idx:end_idx]
-                data = json.loads(json_str)
-
-                # Validate sentiment
-                valid_sentiments = ['bullish', 'bearish', 'neutral']
-                sentiment = data.get('market_sentiment', 'neutral').lower()
-                if sentiment not in valid_sentiments:
-                    sentiment = 'neutral'
-
-                # Ensure top_headlines is list of dicts
-                top_headlines = data.get('top_headlines', [])
-                if not isinstance(top_headlines, list):
-                    top_headlines = []
-
-                # Ensure key_catalysts is list
-                key_catalysts = data.get('key_catalysts', [])
-                if not isinstance(key_catalysts, list):
-                    key_catalysts = []
+            # Validate the first embedded JSON object straight from its text
+            data = extract_json_model(str(result), SummaryResponse)
 
+            if data is not None:
                 return {
-                    'market_overview': data.get('market_overview', 'Market analysis in progress.'),
-                    'stock_context': data.get('stock_context', f'Analyzing {ticker} performance.'),
-                    'key_catalysts': key_catalysts[:3],  # Limit to 3
-                    'top_headlines': top_headlines[:3],  # Limit to 3
-                    'market_sentiment': sentiment,
-                    'confidence_score': float(data.get('confidence_score', 0.7)),
+                    'market_overview': data.market_overview,
+                    'stock_context': data.stock_context or f'Analyzing {ticker} performance.',
+                    'key_catalysts': data.key_catalysts[:3],  # Limit to 3
+                    'top_headlines': [  # Limit to 3
+                        headline.model_dump() for headline in data.top_headlines[:3]
+                    ],
+                    'market_sentiment': data.market_sentiment,
+                    'confidence_score': data.confidence_score,
                 }
 
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"[SUMMARY AGENT] Error parsing result: {e}")
-            print(f"[SUMMARY AGENT] Result snippet: {result[:200] if result else 'None'}")
+        except (ValueError, KeyError) as e:
+            logger.debug("Error parsing result: %s", e)
 
         # Fallback response
-        print("[SUMMARY AGENT] Using fallback response")
+        logger.debug("Using fallback response, result snippet: %.200s", result)
         return {
             'market_overview': 'Market analysis completed. Reviewing current conditions.',
             'stock_context': f'Analyzing {ticker} in current market context.',
@@ -195,3 +211,9 @@ class SummaryAgent:
             'market_sentiment': 'neutral',
             'confidence_score': 0.5,
         }
+
+
+@lru_cache(maxsize=1)
+def get_summary_agent() -> SummaryAgent:
+    """Get the shared SummaryAgent."""
+    return SummaryAgent()
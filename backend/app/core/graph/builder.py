@@ -1,16 +1,27 @@
 """LangGraph builder for the debate flow."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from langgraph.graph import StateGraph, START, END
-from app.core.graph.state import DebateState
+from app.core.graph.state import DebateState, StreamUpdate
 from app.core.graph.nodes import (
+    STREAM_QUEUE,
     fetch_data_node,
     summary_node,
     bull_analysis_node,
     bear_analysis_node,
+    fused_debate_node,
+    round_complete_node,
     moderator_node,
+    fast_verdict_node,
     error_handler_node,
 )
-from app.core.graph.edges import route_after_fetch, route_after_bear
+from app.core.graph.edges import (
+    route_after_fetch,
+    route_after_fused,
+    route_after_bull,
+    route_after_round,
+)
 
 
 def build_debate_graph() -> StateGraph:
@@ -18,19 +29,28 @@ def build_debate_graph() -> StateGraph:
     Build the LangGraph debate flow.
 
     Flow:
-    START -> fetch_data -> summary -> [bull_analysis OR error_handler]
-                                            |
-                                            v
-                                      bull_analysis
-                                            |
-                                            v
-                                      bear_analysis
-                                            |
-                                [if more rounds] -> bull_analysis (loop)
-                                [if done] -> moderator
-                                            |
-                                            v
-                                          END
+    START -> fetch_data -> [debate + summary OR error_handler]
+                              |
+                              +--> summary -> END   (parallel with the debate)
+                              |
+               1 round:       +--> fused_debate -> END
+                              |    (falls back to the parallel opening
+                              |     round if its answer doesn't parse)
+                              |
+             2+ rounds:       +-----------------+
+                              v                 v
+                        bull_analysis     bear_analysis   (parallel, unless
+                              |                 |          PARALLEL_FIRST_ROUND
+                              |                 |          is off: bull -> bear)
+                              |                 |
+                              +--------+--------+
+                                       v
+                                round_complete
+                                       |
+              [if more rounds] -> bull_analysis -> bear_analysis (rebuttal)
+                                  -> round_complete
+              [if done, clear-cut] -> fast_verdict -> END
+              [if done, close call] -> moderator -> END
 
     Returns:
         Compiled StateGraph
@@ -43,7 +63,10 @@ def build_debate_graph() -> StateGraph:
     builder.add_node("summary", summary_node)
     builder.add_node("bull_analysis", bull_analysis_node)
     builder.add_node("bear_analysis", bear_analysis_node)
+    builder.add_node("fused_debate", fused_debate_node)
+    builder.add_node("round_complete", round_complete_node)
     builder.add_node("moderator", moderator_node)
+    builder.add_node("fast_verdict", fast_verdict_node)
     builder.add_node("error_handler", error_handler_node)
 
     # Define edges
@@ -51,41 +74,93 @@ def build_debate_graph() -> StateGraph:
     # START -> fetch_data
     builder.add_edge(START, "fetch_data")
 
-    # fetch_data -> summary OR error_handler
+    # fetch_data -> summary alongside fused_debate (1 round) OR
+    # bull_analysis + bear_analysis (opening round); OR error_handler
     builder.add_conditional_edges(
         "fetch_data",
         route_after_fetch,
+        ["summary", "fused_debate", "bull_analysis", "bear_analysis", "error_handler"],
+    )
+
+    # summary -> END (its branch finishes on its own)
+    builder.add_edge("summary", END)
+
+    # fused_debate -> END OR the separate agents if its answer didn't parse
+    builder.add_conditional_edges(
+        "fused_debate",
+        route_after_fused,
+        ["bull_analysis", "bear_analysis", END],
+    )
+
+    # bull_analysis -> round_complete (opening round) OR bear_analysis (rebuttal)
+    builder.add_conditional_edges(
+        "bull_analysis",
+        route_after_bull,
         {
-            "summary": "summary",
-            "error_handler": "error_handler",
+            "round_complete": "round_complete",
+            "bear_analysis": "bear_analysis",
         },
     )
 
-    # summary -> bull_analysis
-    builder.add_edge("summary", "bull_analysis")
+    # bear_analysis -> round_complete (joins both branches in the opening round)
+    builder.add_edge("bear_analysis", "round_complete")
 
-    # bull_analysis -> bear_analysis
-    builder.add_edge("bull_analysis", "bear_analysis")
-
-    # bear_analysis -> moderator OR back to bull_analysis (multi-round)
+    # round_complete -> moderator OR fast_verdict (clear-cut) OR back to
+    # bull_analysis (multi-round)
     builder.add_conditional_edges(
-        "bear_analysis",
-        route_after_bear,
+        "round_complete",
+        route_after_round,
         {
             "moderator": "moderator",
+            "fast_verdict": "fast_verdict",
             "bull_analysis": "bull_analysis",
         },
     )
 
-    # moderator -> END
+    # moderator / fast_verdict -> END
     builder.add_edge("moderator", END)
+    builder.add_edge("fast_verdict", END)
 
     # error_handler -> END
     builder.add_edge("error_handler", END)
 
-    # Compile the graph
-    return builder.compile()
+    # Compile the graph. Debates run start-to-finish in one request and never
+    # resume or interrupt, so checkpointing is switched off outright (False,
+    # unlike None, also holds if this graph is ever nested in another)
+    return builder.compile(checkpointer=False, debug=False)
 
 
-# Singleton instance
+# Singleton instance, compiled once per process at import
 debate_graph = build_debate_graph()
+
+
+async def stream_debate(initial_state: DebateState) -> AsyncIterator[StreamUpdate]:
+    """
+    Run a debate and yield its stream updates as the nodes emit them.
+
+    The graph runs in its own task, so a slow consumer never stalls the
+    agents; its errors are re-raised once the updates are drained.
+
+    Args:
+        initial_state: State from create_initial_state
+
+    Yields:
+        StreamUpdates in emission order
+    """
+    queue: asyncio.Queue[StreamUpdate | None] = asyncio.Queue()
+
+    async def run() -> None:
+        # Set inside the task so only this debate's nodes see the queue
+        STREAM_QUEUE.set(queue)
+        try:
+            await debate_graph.ainvoke(initial_state)
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (update := await queue.get()) is not None:
+            yield update
+        await task
+    finally:
+        task.cancel()
@@ -1,34 +1,68 @@
 """LangGraph edge routing functions."""
 
 from typing import Literal
+from langgraph.graph import END
+from app.config import settings
+from app.core.agents.moderator_agent import decisive_verdict
 from app.core.graph.state import DebateState
 
 
 def route_after_fetch(
     state: DebateState,
-) -> Literal["summary", "error_handler"]:
+) -> list[str] | Literal["error_handler"]:
     """
     Route after data fetching.
 
+    The summary only reads the fetched data, so it runs as a branch of its
+    own alongside the debate. A single-round debate has no rebuttals, so
+    (unless disabled) it runs as one fused bull/bear/verdict call;
+    otherwise the opening round's bull and bear cases run as parallel
+    branches (unless disabled, in which case the bear follows the bull).
+
     Args:
         state: Current debate state
 
     Returns:
-        Next node name
+        Next node name(s)
     """
     if state.get("error") or state.get("stock_data") is None:
         return "error_handler"
-    return "summary"
+    if settings.fused_single_round and state.get("max_rounds", 1) == 1:
+        return ["summary", "fused_debate"]
+    if settings.parallel_first_round:
+        return ["summary", "bull_analysis", "bear_analysis"]
+    return ["summary", "bull_analysis"]
+
+
+def route_after_fused(state: DebateState) -> list[str] | str:
+    """
+    Route after the fused single-round debate.
+
+    Ends the debate if the fused call produced a verdict, otherwise falls
+    back to the separate agents' opening round, routed as route_after_fetch
+    would (bull and bear in parallel, or the bull with the bear following).
+
+    Args:
+        state: Current debate state
+
+    Returns:
+        Next node name(s)
+    """
+    if state.get("moderator_analysis") is not None:
+        return END
+    if settings.parallel_first_round:
+        return ["bull_analysis", "bear_analysis"]
+    return "bull_analysis"
 
 
-def route_after_bear(
+def route_after_bull(
     state: DebateState,
-) -> Literal["moderator", "bull_analysis"]:
+) -> Literal["round_complete", "bear_analysis"]:
     """
-    Route after bear analysis.
+    Route after bull analysis.
 
-    For multi-round debates, loops back to bull for rebuttal.
-    Otherwise proceeds to moderator for final verdict.
+    In a parallel opening round the bear is already running alongside, so
+    the bull goes straight to the round barrier; otherwise the bear follows.
 
     Args:
         state: Current debate state
@@ -36,9 +70,32 @@ def route_after_bear(
     Returns:
         Next node name
     """
-    current_round = state.get("current_round", 1)
-    max_rounds = state.get("max_rounds", 1)
+    if settings.parallel_first_round and state.get("current_round", 1) == 1:
+        return "round_complete"
+    return "bear_analysis"
 
-    if current_round < max_rounds:
+
+def route_after_round(
+    state: DebateState,
+) -> Literal["moderator", "fast_verdict", "bull_analysis"]:
+    """
+    Route once both sides have finished a round.
+
+    For multi-round debates, loops back to bull for rebuttal. Otherwise
+    proceeds to the verdict: a deterministic fast verdict when one side
+    clearly dominates, the moderator LLM when the call is close.
+
+    Args:
+        state: Current debate state
+
+    Returns:
+        Next node name
+    """
+    if state.get("phase") == "bull_analyzing":
         return "bull_analysis"
+    if decisive_verdict(
+        state["bull_analysis"].confidence_score,
+        state["bear_analysis"].confidence_score,
+    ):
+        return "fast_verdict"
     return "moderator"
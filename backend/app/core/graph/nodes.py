@@ -1,20 +1,73 @@
 """LangGraph nodes for the debate flow."""
 
 import asyncio
+import logging
+from contextvars import ContextVar
+from app.config import settings
 from app.core.graph.state import (
+    MARKET_INDICES_ADAPTER,
+    NEWS_ITEMS_ADAPTER,
     DebateState,
     StockData,
     NewsItem,
     MarketIndex,
     StreamUpdate,
+    SummaryAnalysis,
+    TopHeadline,
 )
 from app.services.stock_service import get_stock_data
-from app.services.news_service import search_news, build_news_query
+from app.services.news_service import search_news, build_news_query, filter_relevant_news
 from app.services.market_service import fetch_market_indices
-from app.core.agents.bull_agent import BullAgent
-from app.core.agents.bear_agent import BearAgent
-from app.core.agents.moderator_agent import ModeratorAgent
-from app.core.agents.summary_agent import SummaryAgent
+from app.core.agents.debate_agent import get_debate_agent
+from app.core.agents.fused_agent import get_fused_debate_agent
+from app.core.agents.moderator_agent import get_moderator_agent
+from app.core.agents.summary_agent import get_summary_agent
+
+logger = logging.getLogger(__name__)
+
+# Queue of the request currently streaming this debate. Set around graph
+# execution by stream_debate; unset (None) for plain /analyze calls
+STREAM_QUEUE: ContextVar[asyncio.Queue[StreamUpdate | None] | None] = ContextVar(
+    "stream_queue", default=None
+)
+
+# Below this many relevant items from the ticker-only search, fetch_data
+# also runs the sharper company-name search
+MIN_RELEVANT_NEWS = 10
+
+
+def emit(update: StreamUpdate) -> None:
+    """
+    Push a stream update to the client as soon as it happens.
+
+    Must be called from the event loop (nodes are async for this reason).
+
+    Args:
+        update: Update to send; dropped when nothing is streaming
+    """
+    queue = STREAM_QUEUE.get()
+    if queue is not None:
+        queue.put_nowait(update)
+
+
+def _emit_verdict(content: dict, recommendation: str) -> None:
+    """Emit the updates for a verdict produced in one go (no token stream)."""
+    emit(
+        StreamUpdate(
+            type="agent_start",
+            agent="moderator",
+            message="Moderator synthesizing verdict...",
+        )
+    )
+    emit(
+        StreamUpdate(
+            type="agent_response",
+            agent="moderator",
+            analysis=content,
+            message=f"Verdict: {recommendation}",
+        )
+    )
+    emit(StreamUpdate(type="complete", message="Debate complete"))
 
 
 async def fetch_data_node(state: DebateState) -> dict:
@@ -32,48 +85,54 @@ async def fetch_data_node(state: DebateState) -> dict:
     print("=" * 80)
     ticker = state["ticker"]
 
-    # First fetch stock data to get company name
-    stock_data = await get_stock_data(ticker)
+    # The stock data, a ticker-only news search and the market indices are
+    # independent, so fetch them together instead of one after another.
+    # Fetch more news (30) to allow agents to filter for their perspectives
+    stock_data, broad_news, market_data_raw = await asyncio.gather(
+        get_stock_data(ticker),
+        search_news(build_news_query(ticker, None), max_results=30),
+        fetch_market_indices(),
+    )
 
     if stock_data is None:
+        # error_handler_node reports the error to the client
         return {
             "phase": "error",
             "error": f"Failed to fetch data for ticker: {ticker}",
-            "stream_updates": [
-                StreamUpdate(
-                    type="error",
-                    error=f"Failed to fetch data for ticker: {ticker}",
-                )
-            ],
         }
 
-    # Now search news with company name for better filtering
-    # Fetch more news (30) to allow agents to filter for their perspectives
+    # Filter the batch for relevance now that the company name is known
     company_name = stock_data.company_name
-    news_query = build_news_query(ticker, company_name)
-    news_items = await search_news(
-        news_query,
-        max_results=30,
-        ticker=ticker,
-        company_name=company_name,
-    )
+    news_items = filter_relevant_news(broad_news, ticker, company_name)
 
-    # If no news found, try a broader search without strict filtering
-    if not news_items:
-        print(f"[FETCH_DATA] No news found with strict filtering. Trying broader search for {ticker}")
-        # Try a more general search
-        broader_query = build_news_query(ticker, None)
-        news_items = await search_news(
-            broader_query,
+    # Too little relevant news: also search with the company name
+    if company_name and len(news_items) < MIN_RELEVANT_NEWS:
+        logger.debug(
+            "[FETCH_DATA] %d relevant items. Searching by company name for %s",
+            len(news_items), ticker,
+        )
+        named_news = await search_news(
+            build_news_query(ticker, company_name),
             max_results=30,
-            ticker=None,  # Skip relevance filtering
-            company_name=None,
+            ticker=ticker,
+            company_name=company_name,
         )
-        print(f"[FETCH_DATA] Broader search returned {len(news_items)} items")
+        seen_urls = {item.url for item in named_news}
+        news_items = (
+            named_news + [item for item in news_items if item.url not in seen_urls]
+        )[:30]
+
+    # If no relevant news found, fall back to the unfiltered ticker search
+    if not news_items:
+        logger.debug(
+            "[FETCH_DATA] No relevant news found. Using broader search results (%d items)",
+            len(broad_news),
+        )
+        news_items = broad_news
 
     # If still no news, create a synthetic news item indicating no news
     if not news_items:
-        print(f"[FETCH_DATA] Still no news found. Creating fallback item.")
+        logger.debug("[FETCH_DATA] Still no news found. Creating fallback item.")
         news_items = [
             NewsItem(
                 title=f"No recent news articles found for {company_name or ticker}",
@@ -84,30 +143,33 @@ async def fetch_data_node(state: DebateState) -> dict:
             )
         ]
 
-    # Fetch market indices for immediate display
-    market_data_raw = await fetch_market_indices()
+    # Market indices for immediate display
     market_indices = [MarketIndex(**idx) for idx in market_data_raw.get('indices', [])]
 
+    emit(
+        StreamUpdate(
+            type="data_fetched",
+            stock_data=stock_data.model_dump(),
+            news_items=NEWS_ITEMS_ADAPTER.dump_python(news_items),
+            market_data=MARKET_INDICES_ADAPTER.dump_python(market_indices),
+            message=f"Fetched data for {stock_data.company_name or ticker}",
+        )
+    )
+
     return {
         "stock_data": stock_data,
         "news_items": news_items,
         "market_data": market_indices,
         "phase": "summarizing",
-        "stream_updates": [
-            StreamUpdate(
-                type="data_fetched",
-                stock_data=stock_data.model_dump(),
-                news_items=[item.model_dump() for item in news_items],
-                market_data=[idx.model_dump() for idx in market_indices],
-                message=f"Fetched data for {stock_data.company_name or ticker}",
-            )
-        ],
     }
 
 
 async def summary_node(state: DebateState) -> dict:
     """
-    Node: Generate market + stock summary before debate starts.
+    Node: Generate market + stock summary, alongside the debate.
+
+    Only reads the fetched data and writes its own keys, so it can share a
+    step with the bull/bear (or fused) nodes.
 
     Args:
         state: Current debate state
@@ -120,13 +182,12 @@ async def summary_node(state: DebateState) -> dict:
     print(f"[SUMMARY_NODE] Ticker: {state['ticker']}")
     print("=" * 80)
 
-    # Fetch market indices
-    market_data_raw = await fetch_market_indices()
-    market_indices = [MarketIndex(**idx) for idx in market_data_raw.get('indices', [])]
-    print(f"[SUMMARY_NODE] Fetched {len(market_indices)} market indices")
+    # Reuse the indices fetch_data_node already fetched
+    market_indices = state["market_data"]
+    market_data_raw = {"indices": MARKET_INDICES_ADAPTER.dump_python(market_indices)}
 
     # Generate summary using AI agent
-    summary_agent = SummaryAgent()
+    summary_agent = get_summary_agent()
     print(f"[SUMMARY_NODE] Calling summary agent...")
     summary_dict = await summary_agent.generate_summary(
         stock_data=state["stock_data"],
@@ -136,8 +197,6 @@ async def summary_node(state: DebateState) -> dict:
     print(f"[SUMMARY_NODE] Summary generated: {summary_dict.keys()}")
 
     # Convert to SummaryAnalysis model
-    from app.core.graph.state import SummaryAnalysis, TopHeadline
-
     top_headlines = [
         TopHeadline(**headline)
         for headline in summary_dict.get('top_headlines', [])
@@ -155,19 +214,18 @@ async def summary_node(state: DebateState) -> dict:
     stream_update = StreamUpdate(
         type="summary_complete",
         message="Market summary generated",
-        market_data=[idx.model_dump() for idx in market_indices],
+        market_data=market_data_raw["indices"],
         summary_analysis=summary_analysis.model_dump(),
     )
 
     print(f"[SUMMARY_NODE] Streaming update: type={stream_update.type}")
     print(f"[SUMMARY_NODE] Market data count: {len(market_indices)}")
     print(f"[SUMMARY_NODE] Summary analysis: {summary_analysis.market_overview[:100]}...")
+    emit(stream_update)
 
     return {
         "market_data": market_indices,
         "summary_analysis": summary_analysis,
-        "phase": "bull_analyzing",
-        "stream_updates": [stream_update],
     }
 
 
@@ -181,7 +239,7 @@ async def bull_analysis_node(state: DebateState) -> dict:
     Returns:
         Updated state fields with bull analysis
     """
-    bull_agent = BullAgent()
+    bull_agent = get_debate_agent("bull")
 
     # Get bear's previous analysis for multi-round debates
     bear_rebuttal = None
@@ -189,118 +247,192 @@ async def bull_analysis_node(state: DebateState) -> dict:
         bear_rebuttal = state["bear_analysis"]
 
     # Notify that bull is starting
-    stream_updates = [
+    emit(
         StreamUpdate(
             type="agent_start",
             agent="bull",
             round_number=state["current_round"],
             message="Bull agent analyzing...",
         )
-    ]
+    )
 
     analysis = await bull_agent.analyze(
         stock_data=state["stock_data"],
         news_items=state["news_items"],
         time_horizon=state["time_horizon"],
-        bear_rebuttal=bear_rebuttal,
+        opponent_analysis=bear_rebuttal,
         round_number=state["current_round"],
     )
 
     # Add analysis to debate history
+    content = analysis.to_dict()
     debate_entry = {
         "role": "bull",
         "round": state["current_round"],
-        "content": analysis.to_dict(),
+        "content": content,
     }
 
-    stream_updates.append(
+    emit(
         StreamUpdate(
             type="agent_response",
             agent="bull",
-            analysis=analysis.to_dict(),
+            analysis=content,
             round_number=state["current_round"],
         )
     )
 
-    return {
+    updates = {
         "bull_analysis": analysis,
         "debate_history": [debate_entry],
-        "phase": "bear_analyzing",
-        "stream_updates": stream_updates,
     }
 
+    # In rebuttal rounds the bear follows; in a parallel opening round it
+    # is already running and the round barrier sets the phase
+    if state["current_round"] > 1 or not settings.parallel_first_round:
+        updates["phase"] = "bear_analyzing"
+
+    return updates
+
 
 async def bear_analysis_node(state: DebateState) -> dict:
     """
     Node 3: Bear agent analyzes risks and counters bull arguments.
 
+    In a parallel opening round this runs alongside the bull, so there is
+    no bull analysis to counter yet; otherwise it sees the bull's latest case.
+
     Args:
         state: Current debate state
 
     Returns:
         Updated state fields with bear analysis
     """
-    bear_agent = BearAgent()
+    bear_agent = get_debate_agent("bear")
 
     # Get bull's analysis to counter
     bull_claims = state.get("bull_analysis")
 
-    stream_updates = [
+    emit(
         StreamUpdate(
             type="agent_start",
             agent="bear",
             round_number=state["current_round"],
             message="Bear agent analyzing...",
         )
-    ]
+    )
 
     analysis = await bear_agent.analyze(
         stock_data=state["stock_data"],
         news_items=state["news_items"],
         time_horizon=state["time_horizon"],
-        bull_claims=bull_claims,
+        opponent_analysis=bull_claims,
         round_number=state["current_round"],
     )
 
+    content = analysis.to_dict()
     debate_entry = {
         "role": "bear",
         "round": state["current_round"],
-        "content": analysis.to_dict(),
+        "content": content,
     }
 
-    stream_updates.append(
+    emit(
         StreamUpdate(
             type="agent_response",
             agent="bear",
-            analysis=analysis.to_dict(),
+            analysis=content,
             round_number=state["current_round"],
         )
     )
 
-    # Check if we need more rounds
-    current_round = state["current_round"]
-    max_rounds = state["max_rounds"]
-    next_phase = "moderating" if current_round >= max_rounds else "bull_analyzing"
-
-    # If continuing to next round, increment counter
-    updates = {
+    return {
         "bear_analysis": analysis,
         "debate_history": [debate_entry],
-        "phase": next_phase,
-        "stream_updates": stream_updates,
     }
 
-    if next_phase == "bull_analyzing":
-        updates["current_round"] = current_round + 1
-        updates["stream_updates"].append(
+
+async def round_complete_node(state: DebateState) -> dict:
+    """
+    Barrier after both sides of a round have answered.
+
+    Args:
+        state: Current debate state
+
+    Returns:
+        Updated state fields with the next phase (and round, if continuing)
+    """
+    current_round = state["current_round"]
+    if current_round >= state["max_rounds"]:
+        return {"phase": "moderating"}
+
+    emit(
+        StreamUpdate(
+            type="round_complete",
+            round_number=current_round,
+            message=f"Round {current_round} complete. Starting round {current_round + 1}...",
+        )
+    )
+
+    return {
+        "phase": "bull_analyzing",
+        "current_round": current_round + 1,
+    }
+
+
+async def fused_debate_node(state: DebateState) -> dict:
+    """
+    Node: Single-round debate as one combined bull/bear/verdict LLM call.
+
+    Args:
+        state: Current debate state
+
+    Returns:
+        Updated state fields with all three analyses, or no analyses if the
+        combined answer didn't parse (the graph then runs the separate agents)
+    """
+    result = await get_fused_debate_agent().debate(
+        stock_data=state["stock_data"],
+        news_items=state["news_items"],
+        time_horizon=state["time_horizon"],
+    )
+    if result is None:
+        return {}
+
+    bull, bear, moderator = result
+
+    debate_history = []
+    for analysis in (bull, bear):
+        agent = analysis.agent_type
+        content = analysis.to_dict()
+        debate_history.append({"role": agent, "round": 1, "content": content})
+        emit(
+            StreamUpdate(
+                type="agent_start",
+                agent=agent,
+                round_number=1,
+                message=f"{agent.capitalize()} agent analyzing...",
+            )
+        )
+        emit(
             StreamUpdate(
-                type="round_complete",
-                round_number=current_round,
-                message=f"Round {current_round} complete. Starting round {current_round + 1}...",
+                type="agent_response",
+                agent=agent,
+                analysis=content,
+                round_number=1,
             )
         )
 
-    return updates
+    content = moderator.to_dict()
+    debate_history.append({"role": "moderator", "round": "final", "content": content})
+    _emit_verdict(content, moderator.recommendation)
+
+    return {
+        "bull_analysis": bull,
+        "bear_analysis": bear,
+        "moderator_analysis": moderator,
+        "debate_history": debate_history,
+        "phase": "complete",
+    }
 
 
 async def moderator_node(state: DebateState) -> dict:
@@ -313,55 +445,89 @@ async def moderator_node(state: DebateState) -> dict:
     Returns:
         Updated state fields with moderator verdict
     """
-    moderator_agent = ModeratorAgent()
+    moderator_agent = get_moderator_agent()
 
-    stream_updates = [
+    emit(
         StreamUpdate(
             type="agent_start",
             agent="moderator",
             message="Moderator synthesizing verdict...",
         )
-    ]
+    )
 
-    analysis = await moderator_agent.synthesize(
+    # The verdict is still streamed from the LLM (and optionally sent out as
+    # "token" updates); the final analysis is parsed from the joined text
+    chunks = []
+    async for chunk in moderator_agent.synthesize_stream(
         stock_data=state["stock_data"],
         bull_analysis=state["bull_analysis"],
         bear_analysis=state["bear_analysis"],
         time_horizon=state["time_horizon"],
         debate_history=state.get("debate_history"),
+    ):
+        chunks.append(chunk)
+        if settings.stream_tokens:
+            emit(StreamUpdate(type="token", agent="moderator", content=chunk))
+
+    analysis = moderator_agent.build_verdict(
+        "".join(chunks),
+        stock_data=state["stock_data"],
+        bull_analysis=state["bull_analysis"],
+        bear_analysis=state["bear_analysis"],
     )
 
+    content = analysis.to_dict()
     debate_entry = {
         "role": "moderator",
         "round": "final",
-        "content": analysis.to_dict(),
+        "content": content,
     }
 
-    stream_updates.append(
+    emit(
         StreamUpdate(
             type="agent_response",
             agent="moderator",
-            analysis=analysis.to_dict(),
+            analysis=content,
             message=f"Verdict: {analysis.recommendation}",
         )
     )
+    emit(StreamUpdate(type="complete", message="Debate complete"))
 
-    stream_updates.append(
-        StreamUpdate(
-            type="complete",
-            message="Debate complete",
-        )
+    return {
+        "moderator_analysis": analysis,
+        "debate_history": [debate_entry],
+        "phase": "complete",
+    }
+
+
+async def fast_verdict_node(state: DebateState) -> dict:
+    """
+    Node: Deterministic verdict for a clear-cut debate (no LLM call).
+
+    Args:
+        state: Current debate state
+
+    Returns:
+        Updated state fields with moderator verdict
+    """
+    analysis = get_moderator_agent().fast_verdict(
+        stock_data=state["stock_data"],
+        bull_analysis=state["bull_analysis"],
+        bear_analysis=state["bear_analysis"],
+        time_horizon=state["time_horizon"],
     )
 
+    content = analysis.to_dict()
+    _emit_verdict(content, analysis.recommendation)
+
     return {
         "moderator_analysis": analysis,
-        "debate_history": [debate_entry],
+        "debate_history": [{"role": "moderator", "round": "final", "content": content}],
         "phase": "complete",
-        "stream_updates": stream_updates,
     }
 
 
-def error_handler_node(state: DebateState) -> dict:
+async def error_handler_node(state: DebateState) -> dict:
     """
     Error handling node.
 
@@ -371,12 +537,10 @@ def error_handler_node(state: DebateState) -> dict:
     Returns:
         Updated state with error info
     """
-    return {
-        "phase": "error",
-        "stream_updates": [
-            StreamUpdate(
-                type="error",
-                error=state.get("error", "Unknown error occurred"),
-            )
-        ],
-    }
+    emit(
+        StreamUpdate(
+            type="error",
+            error=state.get("error", "Unknown error occurred"),
+        )
+    )
+    return {"phase": "error"}
@@ -1,12 +1,20 @@
 """LangGraph state schema for the debate flow."""
 
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from typing import Literal, Annotated
 from typing_extensions import TypedDict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 import operator
+import orjson
 
 from app.api.schemas.request import TimeHorizon
+from app.api.schemas.response import AgentType, MarketSentiment
+
+
+def _utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
 
 
 class StockData(BaseModel):
@@ -23,7 +31,8 @@ class StockData(BaseModel):
     fifty_two_week_low: float = 0.0
     sector: str | None = None
     industry: str | None = None
-    historical_prices: list[dict] = Field(default_factory=list)
+    # Columns keyed date/open/high/low/close/volume, one entry per day
+    historical_prices: dict[str, list] = Field(default_factory=dict)
 
     # Shareholding pattern
     promoter_holding: float | None = None
@@ -52,6 +61,11 @@ class StockData(BaseModel):
     revenue_growth: float | None = None
     profit_growth: float | None = None
 
+    @property
+    def display_name(self) -> str:
+        """Company name, or the ticker if it is unknown."""
+        return self.company_name or self.ticker
+
 
 class NewsItem(BaseModel):
     """News article structure."""
@@ -74,6 +88,12 @@ class MarketIndex(BaseModel):
     trend: str  # 'up', 'down', 'flat'
 
 
+# Shared list adapters: dump a whole list in one pydantic-core call instead
+# of dispatching model_dump() per element
+NEWS_ITEMS_ADAPTER = TypeAdapter(list[NewsItem])
+MARKET_INDICES_ADAPTER = TypeAdapter(list[MarketIndex])
+
+
 class TopHeadline(BaseModel):
     """Top headline for summary."""
 
@@ -89,7 +109,7 @@ class SummaryAnalysis(BaseModel):
     stock_context: str
     key_catalysts: list[str] = Field(default_factory=list)
     top_headlines: list[TopHeadline] = Field(default_factory=list)
-    market_sentiment: Literal["bullish", "bearish", "neutral"] = "neutral"
+    market_sentiment: MarketSentiment = "neutral"
     confidence_score: float = Field(ge=0.0, le=1.0, default=0.7)
 
 
@@ -112,16 +132,30 @@ class AgentArgument(BaseModel):
 class AgentAnalysis(BaseModel):
     """Complete analysis from an agent."""
 
-    agent_type: Literal["bull", "bear", "moderator"]
+    agent_type: AgentType
     summary: str
     arguments: list[AgentArgument] = Field(default_factory=list)
     recommendation: str | None = None
     confidence_score: float = Field(ge=0.0, le=1.0)
     sources: list[Source] = Field(default_factory=list)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
+
+    # to_dict() result, built on first call
+    _dict: dict | None = PrivateAttr(default=None)
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
+        """
+        Convert to dictionary for JSON serialization.
+
+        The dict is built once and shared by every caller (history entry,
+        stream update), so treat both it and the analysis as read-only.
+        """
+        if self._dict is None:
+            self._dict = self._build_dict()
+        return self._dict
+
+    def _build_dict(self) -> dict:
+        """Build the to_dict() payload."""
         return {
             "agent_type": self.agent_type,
             "summary": self.summary,
@@ -143,7 +177,8 @@ class AgentAnalysis(BaseModel):
         }
 
 
-class StreamUpdate(BaseModel):
+@dataclass(slots=True)
+class StreamUpdate:
     """Stream update for WebSocket."""
 
     type: str
@@ -158,6 +193,27 @@ class StreamUpdate(BaseModel):
     round_number: int | None = None
     message: str | None = None
 
+    # Compact JSON encoding, serialized once when the node emits the update
+    _json: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._json = orjson.dumps(
+            {
+                name: value
+                for name in _STREAM_UPDATE_FIELDS
+                if (value := getattr(self, name)) is not None
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+        )
+
+    def to_json(self) -> bytes:
+        """Return the cached JSON encoding (None fields omitted)."""
+        return self._json
+
+
+# Payload fields of a StreamUpdate, in declaration order
+_STREAM_UPDATE_FIELDS = tuple(f.name for f in fields(StreamUpdate) if f.init)
+
 
 class DebateState(TypedDict):
     """Main LangGraph state schema for the debate flow."""
@@ -198,9 +254,6 @@ class DebateState(TypedDict):
     ]
     error: str | None
 
-    # Streaming updates queue
-    stream_updates: list[StreamUpdate]
-
 
 def create_initial_state(
     ticker: str,
@@ -225,5 +278,4 @@ def create_initial_state(
         debate_history=[],
         phase="initialized",
         error=None,
-        stream_updates=[],
     )
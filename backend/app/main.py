@@ -9,13 +9,26 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
-from datetime import datetime
-from fastapi import FastAPI
+import asyncio
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.routes import analysis, websocket
 from app.api.schemas.response import HealthResponse
+from app.services.io_pool import IO_POOL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure the event loop for the lifetime of the app."""
+    # asyncio.to_thread (LLM calls, cache I/O) shares the service pool
+    asyncio.get_running_loop().set_default_executor(IO_POOL)
+    yield
+
 
 app = FastAPI(
     title="InsightFlow API",
@@ -23,6 +36,8 @@ app = FastAPI(
     version=settings.app_version,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration
@@ -49,14 +64,16 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse, tags=["health"])
-async def health_check():
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["health"])
+async def health_check() -> Response:
     """Health check endpoint."""
-    return HealthResponse(
+    # Serialize with pydantic-core directly instead of jsonable_encoder
+    health = HealthResponse(
         status="healthy",
         version=settings.app_version,
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
     )
+    return Response(content=health.model_dump_json(), media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -67,4 +84,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        loop="uvloop",
+        http="httptools",
     )
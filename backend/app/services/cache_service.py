@@ -1,89 +1,443 @@
 """Cache service for reducing API calls."""
 
 import asyncio
-from datetime import datetime, timedelta
+import contextlib
+import hashlib
+import multiprocessing
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Any
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import httpx
+import orjson
 import yfinance as yf
 
+from app.config import settings
+
+# Yahoo Finance endpoints used directly by the async ticker tape path. The
+# quote endpoint needs a crumb, obtained (as yfinance does) from the crumb
+# endpoint once the cookie endpoint has set Yahoo's session cookie
+_YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+_YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+_YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+_YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+_YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Max concurrent requests to the Yahoo host
+_MAX_CONCURRENCY = 64
+
+# Retry policy for throttled / flaky Yahoo responses
+_MAX_RETRIES = 3
+_BACKOFF_SECONDS = 0.5
+
+# Nifty 50 constituents
+NIFTY_50_SYMBOLS = (
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
+    "HINDUNILVR", "SBIN", "BHARTIARTL", "KOTAKBANK", "ITC",
+    "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "TATASTEEL",
+    "BAJFINANCE", "HCLTECH", "WIPRO", "SUNPHARMA", "TITAN",
+    "ULTRACEMCO", "NESTLEIND", "POWERGRID", "NTPC", "TECHM",
+    "ONGC", "JSWSTEEL", "TATAMOTORS", "M&M", "ADANIENT",
+    "COALINDIA", "BAJAJFINSV", "GRASIM", "DIVISLAB", "DRREDDY",
+    "BRITANNIA", "CIPLA", "EICHERMOT", "APOLLOHOSP", "TATACONSUM",
+    "HINDALCO", "HEROMOTOCO", "BPCL", "INDUSINDBK", "SBILIFE",
+    "UPL", "ADANIPORTS", "HDFCLIFE", "BAJAJ-AUTO", "SHREECEM",
+)
+
+# Pre-joined `symbols` query parameter for the batched quote request
+_NIFTY_50_QUOTE_SYMBOLS = ",".join(f"{symbol}.NS" for symbol in NIFTY_50_SYMBOLS)
+
+
+def _init_yfinance_worker() -> None:
+    """Pre-import yfinance/pandas so a worker's first fetch skips import cost."""
+    import pandas  # noqa: F401
+    import yfinance  # noqa: F401
+
+
+def _short_name(symbol: str) -> str | None:
+    """Look up a symbol's company name through yfinance (None on error)."""
+    try:
+        return yf.Ticker(f"{symbol}.NS").info.get("shortName")
+    except Exception:
+        return None
+
+
+def _download_stock_data(
+    symbols: list[str], unnamed: frozenset[str] = frozenset()
+) -> list[dict | None]:
+    """
+    Fetch price rows for several symbols in one batched yfinance download.
+
+    Runs in a worker process (yfinance fallback). The download has no
+    company names, so they are looked up for the unnamed symbols only;
+    other rows carry the bare symbol and the caller fills in cached names.
+
+    Args:
+        symbols: Nifty symbols without the .NS suffix
+        unnamed: Symbols whose company name the caller hasn't cached yet
+
+    Returns:
+        One row per symbol, in order, or None where there is no price
+    """
+    try:
+        frame = yf.download(
+            [f"{symbol}.NS" for symbol in symbols],
+            period="2d",
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+    except Exception:
+        return [None] * len(symbols)
+
+    rows: list[dict | None] = []
+    for symbol in symbols:
+        try:
+            closes = frame[f"{symbol}.NS"]["Close"].dropna()
+        except (KeyError, TypeError):
+            closes = None
+        if closes is None or closes.empty:
+            rows.append(None)
+            continue
+
+        current_price = float(closes.iloc[-1])
+        if len(closes) >= 2:
+            prev_close = float(closes.iloc[-2])
+            change_pct = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+        else:
+            change_pct = 0
+
+        rows.append({
+            "symbol": symbol,
+            "price": round(current_price, 2),
+            "change": round(change_pct, 2),
+            "name": symbol,
+        })
+
+    lookups = [row for row in rows if row is not None and row["symbol"] in unnamed]
+    if lookups:
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            names = pool.map(_short_name, [row["symbol"] for row in lookups])
+            for row, name in zip(lookups, names):
+                if name:
+                    row["name"] = name
+    return rows
+
+
+# Persistent worker processes for the yfinance fallback; pandas-heavy work
+# there doesn't contend for the server's GIL, and workers stay warm. Each
+# refresh submits at most one batched download
+_YF_PROCESS_POOL = ProcessPoolExecutor(
+    max_workers=2,
+    mp_context=multiprocessing.get_context("spawn"),
+    initializer=_init_yfinance_worker,
+)
+
 
 class TickerTapeCache:
-    """In-memory cache for ticker tape data with TTL."""
+    """
+    Ticker tape data cache with TTL and stale-while-revalidate.
+
+    Fresh data is served as-is; data past the TTL but within the stale
+    window is served immediately while a background refresh runs. Each
+    refresh is also written to a snapshot file, so restarted and sibling
+    workers start from it instead of fetching all 50 symbols.
+    """
 
-    def __init__(self, ttl_minutes: int = 5):
+    def __init__(
+        self,
+        ttl_minutes: int = 5,
+        stale_minutes: int = 30,
+        snapshot_path: str | None = None,
+    ):
         self._cache: dict[str, Any] | None = None
         self._last_updated: datetime | None = None
         self._ttl = timedelta(minutes=ttl_minutes)
+        self._stale_ttl = timedelta(minutes=stale_minutes)
+        self._snapshot_path = snapshot_path
+        self._snapshot_loaded = False
+        self._refresh_task: asyncio.Task | None = None
         self._lock = asyncio.Lock()
-        self._executor = ThreadPoolExecutor(max_workers=10)
+        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        self._client: httpx.AsyncClient | None = None
+        self._crumb: str | None = None
+        # Company names by symbol, kept across refreshes (they don't change)
+        self._names: dict[str, str] = {}
+
+    def _age(self) -> timedelta | None:
+        """Age of the cached data, or None if there is none."""
+        if self._cache is None or self._last_updated is None:
+            return None
+        return datetime.now(timezone.utc) - self._last_updated
 
     def _is_valid(self) -> bool:
         """Check if cache is still valid."""
-        if self._cache is None or self._last_updated is None:
-            return False
-        return datetime.utcnow() - self._last_updated < self._ttl
+        age = self._age()
+        return age is not None and age < self._ttl
+
+    def _read_snapshot(self) -> dict[str, Any] | None:
+        """Read the snapshot file, or None if missing/unreadable."""
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _write_snapshot(self, data: dict[str, Any]) -> None:
+        """Atomically replace the snapshot file."""
+        tmp_path = f"{self._snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, self._snapshot_path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
 
-    def _fetch_stock_data(self, symbol: str) -> dict | None:
-        """Fetch single stock data synchronously."""
+    async def _load_snapshot(self) -> None:
+        """Adopt the snapshot if it is newer than the in-memory data."""
+        if not self._snapshot_path:
+            return
+        data = await asyncio.to_thread(self._read_snapshot)
         try:
-            ticker = yf.Ticker(f"{symbol}.NS")
-            info = ticker.info
-            hist = ticker.history(period="2d")
+            stored_at = datetime.fromisoformat(data["cached_at"])
+        except (TypeError, KeyError, ValueError):
+            return
+        if stored_at.tzinfo is None:
+            # Snapshots written before timestamps were timezone-aware
+            stored_at = stored_at.replace(tzinfo=timezone.utc)
+        if self._last_updated is None or stored_at > self._last_updated:
+            self._cache = data
+            self._last_updated = stored_at
+            # Reuse the snapshot's company names if a later fetch lacks them
+            for row in data.get("tickers", []):
+                symbol, name = row.get("symbol"), row.get("name")
+                if symbol and name and name != symbol:
+                    self._names.setdefault(symbol, name)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared keep-alive HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=_YAHOO_HEADERS,
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONCURRENCY,
+                    max_keepalive_connections=_MAX_CONCURRENCY,
+                ),
+            )
+        return self._client
 
-            if hist.empty or len(hist) < 1:
+    async def _get_json(self, url: str, params: dict[str, str]) -> Any | None:
+        """GET a Yahoo endpoint with exponential backoff on 429/5xx/network errors."""
+        client = self._get_client()
+        delay = _BACKOFF_SECONDS
+        for attempt in range(_MAX_RETRIES):
+            try:
+                async with self._semaphore:
+                    response = await client.get(url, params=params)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise httpx.HTTPStatusError(
+                        f"Retryable status {response.status_code}",
+                        request=response.request,
+                        response=response,
+                    )
+                if response.status_code == 401:
+                    # Expired or missing crumb; the next quote call gets a new one
+                    self._crumb = None
+                    return None
+                if response.status_code != 200:
+                    return None
+                return orjson.loads(response.content)
+            except (httpx.HTTPError, orjson.JSONDecodeError):
+                if attempt == _MAX_RETRIES - 1:
+                    return None
+                await asyncio.sleep(delay)
+                delay *= 2
+        return None
+
+    async def _get_crumb(self) -> str | None:
+        """Get the crumb the quote endpoint requires, fetching it if not cached."""
+        if self._crumb is None:
+            client = self._get_client()
+            try:
+                # Sets the session cookie (the response itself is an error page)
+                await client.get(_YAHOO_COOKIE_URL)
+                response = await client.get(_YAHOO_CRUMB_URL)
+            except httpx.HTTPError:
                 return None
+            crumb = response.text.strip()
+            if response.status_code == 200 and crumb and "<" not in crumb:
+                self._crumb = crumb
+        return self._crumb
 
-            current_price = hist['Close'].iloc[-1]
-            if len(hist) >= 2:
-                prev_close = hist['Close'].iloc[-2]
-                change_pct = ((current_price - prev_close) / prev_close) * 100
-            else:
-                change_pct = info.get('regularMarketChangePercent', 0)
-
-            return {
-                "symbol": symbol,
-                "price": round(current_price, 2),
-                "change": round(change_pct, 2),
-                "name": info.get('shortName', symbol),
-            }
-        except Exception:
+    async def _fetch_quotes(self) -> dict[str, dict]:
+        """Fetch quotes for all Nifty 50 symbols in one batched request, keyed by symbol."""
+        data = None
+        # A cached crumb may have expired: retry once with a fresh one
+        for _ in range(2):
+            crumb = await self._get_crumb()
+            if crumb is None:
+                return {}
+            data = await self._get_json(
+                _YAHOO_QUOTE_URL, {"symbols": _NIFTY_50_QUOTE_SYMBOLS, "crumb": crumb}
+            )
+            if data is not None or self._crumb is not None:
+                break
+        if not isinstance(data, dict):
+            return {}
+
+        quotes = (data.get("quoteResponse") or {}).get("result") or []
+        return {
+            quote["symbol"].removesuffix(".NS"): quote
+            for quote in quotes
+            if quote.get("symbol")
+        }
+
+    @staticmethod
+    def _quote_to_row(symbol: str, quote: dict | None) -> dict | None:
+        """Build a ticker row from a batched quote, or None if it lacks prices."""
+        if not quote:
+            return None
+
+        current_price = quote.get("regularMarketPrice")
+        prev_close = quote.get("regularMarketPreviousClose")
+        if current_price is None:
+            return None
+
+        if prev_close:
+            change_pct = ((current_price - prev_close) / prev_close) * 100
+        else:
+            change_pct = quote.get("regularMarketChangePercent", 0)
+
+        return {
+            "symbol": symbol,
+            "price": round(current_price, 2),
+            "change": round(change_pct, 2),
+            "name": quote.get("shortName", symbol),
+        }
+
+    async def _fetch_chart(self, symbol: str) -> dict | None:
+        """Fetch a symbol's last two daily closes and company name from the chart endpoint."""
+        data = await self._get_json(
+            _YAHOO_CHART_URL.format(symbol=f"{symbol}.NS"),
+            {"range": "2d", "interval": "1d"},
+        )
+        try:
+            result = data["chart"]["result"][0]
+            closes = [c for c in result["indicators"]["quote"][0]["close"] if c is not None]
+        except (TypeError, KeyError, IndexError):
+            return None
+
+        if not closes:
             return None
 
+        current_price = closes[-1]
+        meta = result.get("meta") or {}
+        if len(closes) >= 2:
+            prev_close = closes[-2]
+        else:
+            prev_close = meta.get("chartPreviousClose")
+
+        change_pct = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+        return {
+            "price": current_price,
+            "change": change_pct,
+            "name": meta.get("shortName") or meta.get("longName"),
+        }
+
     async def get_ticker_tape_data(self) -> dict[str, Any]:
-        """Get ticker tape data, using cache if valid."""
+        """Get ticker tape data, using cache if valid (or stale, while refreshing)."""
+        if not self._snapshot_loaded:
+            self._snapshot_loaded = True
+            await self._load_snapshot()
+
+        age = self._age()
+        if age is not None and age < self._ttl:
+            return self._cache
+
+        if age is not None and age < self._stale_ttl:
+            # Serve the stale data now; refresh once in the background
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh())
+            return self._cache
+
+        return await self._refresh()
+
+    async def _refresh(self) -> dict[str, Any]:
+        """Fetch fresh ticker tape data, unless another worker already has."""
         async with self._lock:
+            # A concurrent caller or a sibling worker's snapshot may have
+            # refreshed the data while this one waited
+            await self._load_snapshot()
             if self._is_valid():
                 return self._cache
 
-            # Nifty 50 constituents
-            nifty_50_symbols = [
-                "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
-                "HINDUNILVR", "SBIN", "BHARTIARTL", "KOTAKBANK", "ITC",
-                "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "TATASTEEL",
-                "BAJFINANCE", "HCLTECH", "WIPRO", "SUNPHARMA", "TITAN",
-                "ULTRACEMCO", "NESTLEIND", "POWERGRID", "NTPC", "TECHM",
-                "ONGC", "JSWSTEEL", "TATAMOTORS", "M&M", "ADANIENT",
-                "COALINDIA", "BAJAJFINSV", "GRASIM", "DIVISLAB", "DRREDDY",
-                "BRITANNIA", "CIPLA", "EICHERMOT", "APOLLOHOSP", "TATACONSUM",
-                "HINDALCO", "HEROMOTOCO", "BPCL", "INDUSINDBK", "SBILIFE",
-                "UPL", "ADANIPORTS", "HDFCLIFE", "BAJAJ-AUTO", "SHREECEM"
+            # A single batched quote request covers all 50 symbols
+            quotes = await self._fetch_quotes()
+            for symbol, quote in quotes.items():
+                if quote.get("shortName"):
+                    self._names[symbol] = quote["shortName"]
+            results: list[dict | None] = [
+                self._quote_to_row(symbol, quotes.get(symbol))
+                for symbol in NIFTY_50_SYMBOLS
             ]
 
-            loop = asyncio.get_event_loop()
-            tasks = [
-                loop.run_in_executor(self._executor, self._fetch_stock_data, symbol)
-                for symbol in nifty_50_symbols
-            ]
-            results = await asyncio.gather(*tasks)
+            # Fall back to the per-symbol chart endpoint for missing quotes
+            missing = [i for i, r in enumerate(results) if r is None]
+            if missing:
+                charts = await asyncio.gather(
+                    *(self._fetch_chart(NIFTY_50_SYMBOLS[i]) for i in missing),
+                    return_exceptions=True,
+                )
+                for i, chart in zip(missing, charts):
+                    # One symbol failing must not drop its peers
+                    if chart is None or isinstance(chart, BaseException):
+                        continue
+                    symbol = NIFTY_50_SYMBOLS[i]
+                    if chart["name"]:
+                        self._names[symbol] = chart["name"]
+                    results[i] = {
+                        "symbol": symbol,
+                        "price": round(chart["price"], 2),
+                        "change": round(chart["change"], 2),
+                        "name": self._names.get(symbol, symbol),
+                    }
+
+            # Fall back to one batched yfinance download for anything the
+            # direct endpoints missed
+            missing = [i for i, r in enumerate(results) if r is None]
+            if missing:
+                symbols = [NIFTY_50_SYMBOLS[i] for i in missing]
+                loop = asyncio.get_running_loop()
+                try:
+                    fetched = await loop.run_in_executor(
+                        _YF_PROCESS_POOL,
+                        _download_stock_data,
+                        symbols,
+                        frozenset(symbols).difference(self._names),
+                    )
+                except Exception:
+                    fetched = [None] * len(missing)
+                for i, row in zip(missing, fetched):
+                    if row is not None:
+                        if row["name"] != row["symbol"]:
+                            self._names[row["symbol"]] = row["name"]
+                        row["name"] = self._names.get(row["symbol"], row["symbol"])
+                        results[i] = row
 
             ticker_data = [r for r in results if r is not None]
 
+            now = datetime.now(timezone.utc)
             self._cache = {
                 "tickers": ticker_data,
                 "count": len(ticker_data),
-                "cached_at": datetime.utcnow().isoformat(),
+                "cached_at": now.isoformat(),
             }
-            self._last_updated = datetime.utcnow()
+            self._last_updated = now
+            if self._snapshot_path:
+                await asyncio.to_thread(self._write_snapshot, self._cache)
 
             return self._cache
 
@@ -91,7 +445,47 @@ class TickerTapeCache:
         """Force cache invalidation."""
         self._cache = None
         self._last_updated = None
+        if self._snapshot_path:
+            with contextlib.suppress(OSError):
+                os.remove(self._snapshot_path)
+
+
+class ResponseCache:
+    """Bounded in-memory cache of serialized responses with TTL and ETags."""
+
+    def __init__(self, ttl_seconds: int = 30, maxsize: int = 1024):
+        self._entries: OrderedDict[str, tuple[datetime, bytes, str]] = OrderedDict()
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._maxsize = maxsize
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        """Get (body, etag) for key if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, body, etag = entry
+        if datetime.now(timezone.utc) - stored_at >= self._ttl:
+            del self._entries[key]
+            return None
+        return body, etag
+
+    def set(self, key: str, body: bytes) -> tuple[bytes, str]:
+        """Store body under key, evicting the oldest entry when full."""
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self._entries[key] = (datetime.now(timezone.utc), body, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return body, etag
+
 
+# Global singleton instance (5-minute TTL, served stale for up to 30 minutes)
+ticker_tape_cache = TickerTapeCache(
+    ttl_minutes=5,
+    stale_minutes=30,
+    snapshot_path=settings.ticker_tape_snapshot_path,
+)
 
-# Global singleton instance (5-minute TTL)
-ticker_tape_cache = TickerTapeCache(ttl_minutes=5)
+# Serialized /stock/{ticker} responses (30-second TTL)
+stock_response_cache = ResponseCache(ttl_seconds=30, maxsize=1024)
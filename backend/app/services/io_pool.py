@@ -0,0 +1,12 @@
+"""Shared thread pool for blocking network calls."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# One process-wide pool for the sync yfinance / DuckDuckGo calls (and, as the
+# loop's default executor, asyncio.to_thread). These threads mostly wait on
+# the network, so the pool is sized well above the core count
+IO_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4),
+    thread_name_prefix="io",
+)
@@ -1,75 +1,144 @@
 """Market data service for fetching Indian market indices."""
 
+import asyncio
+import time
 import yfinance as yf
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, List, Any
 
+import pandas as pd
+
+from app.services.io_pool import IO_POOL
+
+# How long yfinance lookups are reused. .info is a heavy request whose
+# fields used here (previous close) change at most daily; the intraday
+# price history is refreshed more often
+_INFO_TTL_SECONDS = 300
+_HISTORY_TTL_SECONDS = 60
+
+# Indices shown with every debate
+MARKET_INDICES = {
+    'SENSEX': '^BSESN',
+    'NIFTY 50': '^NSEI',
+    'NIFTY BANK': '^NSEBANK',
+    'NIFTY IT': '^CNXIT',
+}
+
+
+@lru_cache(maxsize=128)
+def _cached_info(symbol: str, ttl_bucket: int) -> dict:
+    """Fetch a symbol's .info (cached per TTL bucket; errors aren't cached)."""
+    return yf.Ticker(symbol).info
+
+
+@lru_cache(maxsize=128)
+def _cached_history(symbol: str, period: str, ttl_bucket: int) -> pd.DataFrame:
+    """Fetch a symbol's price history (cached per TTL bucket)."""
+    return yf.Ticker(symbol).history(period=period)
+
+
+def _get_info(symbol: str) -> dict:
+    """Get a symbol's .info, reusing it for up to _INFO_TTL_SECONDS."""
+    return _cached_info(symbol, int(time.monotonic() // _INFO_TTL_SECONDS))
+
+
+def _get_history(symbol: str, period: str) -> pd.DataFrame:
+    """Get a symbol's price history, reusing it for up to _HISTORY_TTL_SECONDS."""
+    return _cached_history(symbol, period, int(time.monotonic() // _HISTORY_TTL_SECONDS))
+
+
+def _fetch_index(name: str, symbol: str) -> Dict[str, Any]:
+    """Fetch one index synchronously (placeholder row on error)."""
+    try:
+        info = _get_info(symbol)
+        hist = _get_history(symbol, '1d')
+
+        # Get current price from history if available
+        current_price = None
+        if not hist.empty:
+            current_price = hist['Close'].iloc[-1]
+
+        # Fallback to info if history is empty
+        if current_price is None:
+            current_price = info.get('regularMarketPrice') or info.get('previousClose', 0)
+
+        # Calculate change
+        previous_close = info.get('previousClose', current_price)
+        change = current_price - previous_close if previous_close else 0
+        change_percent = (change / previous_close * 100) if previous_close else 0
+
+        # Determine trend
+        trend = 'up' if change > 0 else 'down' if change < 0 else 'flat'
+
+        return {
+            'name': name,
+            'symbol': symbol,
+            'value': round(current_price, 2) if current_price else 0,
+            'change': round(change, 2),
+            'change_percent': round(change_percent, 2),
+            'trend': trend,
+        }
+    except Exception as e:
+        print(f"[MARKET SERVICE] Error fetching {name}: {e}")
+        # Return placeholder data on error
+        return {
+            'name': name,
+            'symbol': symbol,
+            'value': 0,
+            'change': 0,
+            'change_percent': 0,
+            'trend': 'flat',
+        }
+
 
 async def fetch_market_indices() -> Dict[str, Any]:
     """
     Fetch current Indian market indices data.
 
+    The indices are fetched concurrently on worker threads, so the event
+    loop isn't blocked by yfinance.
+
     Returns:
         Dictionary containing indices data with current values and changes.
     """
-    indices = {
-        'SENSEX': '^BSESN',
-        'NIFTY 50': '^NSEI',
-        'NIFTY BANK': '^NSEBANK',
-        'NIFTY IT': '^CNXIT',
-    }
-
-    results = []
-
-    for name, symbol in indices.items():
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period='1d')
-
-            # Get current price from history if available
-            current_price = None
-            if not hist.empty:
-                current_price = hist['Close'].iloc[-1]
-
-            # Fallback to info if history is empty
-            if current_price is None:
-                current_price = info.get('regularMarketPrice') or info.get('previousClose', 0)
-
-            # Calculate change
-            previous_close = info.get('previousClose', current_price)
-            change = current_price - previous_close if previous_close else 0
-            change_percent = (change / previous_close * 100) if previous_close else 0
-
-            # Determine trend
-            trend = 'up' if change > 0 else 'down' if change < 0 else 'flat'
-
-            results.append({
-                'name': name,
-                'symbol': symbol,
-                'value': round(current_price, 2) if current_price else 0,
-                'change': round(change, 2),
-                'change_percent': round(change_percent, 2),
-                'trend': trend,
-            })
-        except Exception as e:
-            print(f"[MARKET SERVICE] Error fetching {name}: {e}")
-            # Return placeholder data on error
-            results.append({
-                'name': name,
-                'symbol': symbol,
-                'value': 0,
-                'change': 0,
-                'change_percent': 0,
-                'trend': 'flat',
-            })
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(IO_POOL, _fetch_index, name, symbol)
+        for name, symbol in MARKET_INDICES.items()
+    ))
 
     return {
-        'indices': results,
-        'timestamp': datetime.utcnow().isoformat(),
+        'indices': list(results),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
     }
 
 
+def _fetch_sector_index(symbol: str, sector_name: str) -> Dict[str, Any] | None:
+    """Fetch a sector index synchronously (None on error)."""
+    try:
+        info = _get_info(symbol)
+        hist = _get_history(symbol, '1d')
+
+        current_price = hist['Close'].iloc[-1] if not hist.empty else info.get('regularMarketPrice', 0)
+        previous_close = info.get('previousClose', current_price)
+        change = current_price - previous_close if previous_close else 0
+        change_percent = (change / previous_close * 100) if previous_close else 0
+        trend = 'up' if change > 0 else 'down' if change < 0 else 'flat'
+
+        return {
+            'name': f'NIFTY {sector_name}',
+            'symbol': symbol,
+            'value': round(current_price, 2),
+            'change': round(change, 2),
+            'change_percent': round(change_percent, 2),
+            'trend': trend,
+        }
+    except Exception as e:
+        print(f"[MARKET SERVICE] Error fetching sector index: {e}")
+        return None
+
+
 async def get_sector_index_for_stock(sector: str | None) -> Dict[str, Any] | None:
     """
     Get relevant sector index based on stock sector.
@@ -107,25 +176,5 @@ async def get_sector_index_for_stock(sector: str | None) -> Dict[str, Any] | Non
     if not symbol:
         return None
 
-    try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        hist = ticker.history(period='1d')
-
-        current_price = hist['Close'].iloc[-1] if not hist.empty else info.get('regularMarketPrice', 0)
-        previous_close = info.get('previousClose', current_price)
-        change = current_price - previous_close if previous_close else 0
-        change_percent = (change / previous_close * 100) if previous_close else 0
-        trend = 'up' if change > 0 else 'down' if change < 0 else 'flat'
-
-        return {
-            'name': f'NIFTY {sector_name}',
-            'symbol': symbol,
-            'value': round(current_price, 2),
-            'change': round(change, 2),
-            'change_percent': round(change_percent, 2),
-            'trend': trend,
-        }
-    except Exception as e:
-        print(f"[MARKET SERVICE] Error fetching sector index: {e}")
-        return None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_POOL, _fetch_sector_index, symbol, sector_name)
@@ -2,24 +2,35 @@
 
 import asyncio
 import re
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple
 from app.tools.search_tool import search_news_sync, parse_news_data
 from app.core.graph.state import NewsItem
-
-# Thread pool for running sync DuckDuckGo calls
-_executor = ThreadPoolExecutor(max_workers=4)
+from app.services.io_pool import IO_POOL
 
 # Maximum age of news articles in days
 MAX_NEWS_AGE_DAYS = 60
 
+# A trailing UTC offset such as "-05:00"
+_UTC_OFFSET = re.compile(r"[+-]\d{2}:?\d{2}$")
+
+
+def _news_cutoff() -> str:
+    """Return the oldest accepted news date (UTC) as a YYYY-MM-DD string."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=MAX_NEWS_AGE_DAYS)
+    return cutoff.strftime("%Y-%m-%d")
 
-def _is_recent_news(date_str: str) -> bool:
+
+@lru_cache(maxsize=4096)
+def _is_recent_news(date_str: str, cutoff: str) -> bool:
     """
     Check if a news item is within the last 60 days.
 
     Args:
         date_str: Date string from news item (ISO format expected)
+        cutoff: Result of _news_cutoff(); part of the cache key, so cached
+            answers roll over daily
 
     Returns:
         True if the news is within MAX_NEWS_AGE_DAYS, False otherwise
@@ -27,72 +38,79 @@ def _is_recent_news(date_str: str) -> bool:
     if not date_str:
         return False
 
+    # UTC ISO dates compare lexicographically: anything dated before the
+    # cutoff day is rejected without parsing. With an offset the UTC day can
+    # differ from the local one, so those dates are converted below instead.
+    if (date_str.endswith("Z") or not _UTC_OFFSET.search(date_str)) and date_str[:10] < cutoff:
+        return False
+
     try:
         # Parse the date string - DuckDuckGo returns ISO format
         news_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        # Get current time (UTC)
-        now = datetime.now(news_date.tzinfo) if news_date.tzinfo else datetime.utcnow()
-        # Check if within 60 days
-        age = now - news_date
-        return age.days <= MAX_NEWS_AGE_DAYS
-    except (ValueError, AttributeError):
+    except ValueError:
         # If date parsing fails, exclude the item to be safe
         return False
 
+    # Compare the UTC calendar day against the cutoff day, so no clock
+    # read is needed per item
+    if news_date.tzinfo is not None:
+        news_date = news_date.astimezone(timezone.utc)
+    return news_date.date().isoformat() >= cutoff
 
-def _is_relevant_news(
-    item: dict,
-    ticker: str,
-    company_name: str | None = None,
-) -> bool:
+
+# Company-name suffixes ignored when matching, and first words too generic
+# to match on their own
+_COMPANY_SUFFIXES = ("limited", "ltd", "ltd.", "inc", "inc.", "corporation", "corp", "corp.")
+_GENERIC_WORDS = frozenset({"the", "new", "india", "indian"})
+
+
+class _RelevanceMatcher(NamedTuple):
+    """Precomputed relevance checks for one stock."""
+
+    clean_ticker: str
+    company: str
+    first_word: re.Pattern | None
+
+    def matches(self, text: str) -> bool:
+        """Check lower-cased news text (title, snippet, url) for the stock."""
+        if self.clean_ticker in text:
+            return True
+        if self.company and self.company in text:
+            return True
+        return self.first_word is not None and self.first_word.search(text) is not None
+
+
+@lru_cache(maxsize=256)
+def _relevance_matcher(ticker: str, company_name: str | None = None) -> _RelevanceMatcher:
     """
-    Check if a news item is relevant to the specific stock.
+    Build the relevance matcher for a stock.
 
     Args:
-        item: News item dict with title, snippet, url
-        ticker: Stock ticker (without exchange suffix)
+        ticker: Stock ticker (exchange suffix is stripped)
         company_name: Optional company name
 
     Returns:
-        True if the news item is relevant to the stock
+        Matcher for the ticker, the company name without its suffix, and
+        the company's first significant word
     """
-    title = item.get("title", "").lower()
-    snippet = item.get("snippet", "").lower()
-    url = item.get("url", "").lower()
-    combined_text = f"{title} {snippet} {url}"
-
     # Clean ticker (remove exchange suffix)
     clean_ticker = ticker.replace(".NS", "").replace(".BO", "").lower()
 
-    # Check for ticker match
-    if clean_ticker in combined_text:
-        return True
-
-    # Check for company name match (if provided)
+    company = ""
+    first_word = None
     if company_name:
-        # Split company name for better matching
         # e.g., "Tata Steel Limited" -> check for "tata steel"
-        company_lower = company_name.lower()
-        # Remove common suffixes
-        for suffix in ["limited", "ltd", "ltd.", "inc", "inc.", "corporation", "corp", "corp."]:
-            company_lower = company_lower.replace(suffix, "").strip()
-
-        # Check if main company name appears
-        if company_lower and company_lower in combined_text:
-            return True
+        company = company_name.lower()
+        for suffix in _COMPANY_SUFFIXES:
+            company = company.replace(suffix, "").strip()
 
-        # Check for first significant word (e.g., "Tata" for "Tata Steel")
-        words = company_lower.split()
-        if words:
-            first_word = words[0]
-            # Only check first word if it's significant (>3 chars) and not generic
-            generic_words = {"the", "new", "india", "indian"}
-            if len(first_word) > 3 and first_word not in generic_words:
-                # Need to check with word boundaries for first word
-                if re.search(rf'\b{re.escape(first_word)}\b', combined_text):
-                    return True
+        # First significant word (e.g., "Tata" for "Tata Steel"), matched
+        # on word boundaries; only if it's >3 chars and not generic
+        words = company.split()
+        if words and len(words[0]) > 3 and words[0] not in _GENERIC_WORDS:
+            first_word = re.compile(rf"\b{re.escape(words[0])}\b")
 
-    return False
+    return _RelevanceMatcher(clean_ticker, company, first_word)
 
 
 async def search_news(
@@ -113,11 +131,11 @@ async def search_news(
     Returns:
         List of NewsItem objects (filtered for relevance)
     """
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     # Fetch more results to allow for filtering
     fetch_count = max_results * 2
     json_str = await loop.run_in_executor(
-        _executor,
+        IO_POOL,
         search_news_sync,
         query,
         fetch_count,
@@ -126,23 +144,29 @@ async def search_news(
     data = parse_news_data(json_str)
 
     # Filter for date (last 60 days only)
+    cutoff = _news_cutoff()
     data = [
         item for item in data
-        if _is_recent_news(item.get("date", ""))
+        if _is_recent_news(item.get("date", ""), cutoff)
     ]
 
     # Filter for relevance if ticker is provided
     if ticker:
+        matcher = _relevance_matcher(ticker, company_name)
         data = [
             item for item in data
-            if _is_relevant_news(item, ticker, company_name)
+            if matcher.matches(
+                f"{item.get('title', '')} {item.get('snippet', '')} {item.get('url', '')}".lower()
+            )
         ]
 
     # Limit to requested count
     data = data[:max_results]
 
+    # search_news_sync already maps every result to these five string
+    # fields, so the items are built without re-validating them
     return [
-        NewsItem(
+        NewsItem.model_construct(
             title=item.get("title", ""),
             snippet=item.get("snippet", ""),
             source=item.get("source", ""),
@@ -153,6 +177,30 @@ async def search_news(
     ]
 
 
+def filter_relevant_news(
+    news_items: list[NewsItem],
+    ticker: str,
+    company_name: str | None = None,
+) -> list[NewsItem]:
+    """
+    Re-filter already fetched news for relevance, without another search.
+
+    Args:
+        news_items: News items from an unfiltered search
+        ticker: Stock ticker for relevance filtering
+        company_name: Optional company name
+
+    Returns:
+        The relevant items, in their original order
+    """
+    matcher = _relevance_matcher(ticker, company_name)
+    return [
+        item for item in news_items
+        if matcher.matches(f"{item.title} {item.snippet} {item.url}".lower())
+    ]
+
+
+@lru_cache(maxsize=512)
 def build_news_query(ticker: str, company_name: str | None = None) -> str:
     """
     Build a news search query for a stock.
@@ -1,35 +1,36 @@
 """Stock data service."""
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from app.tools.yfinance_tool import fetch_stock_data_sync, parse_stock_data
+from functools import lru_cache
+from app.tools.yfinance_tool import StockFields, fetch_stock_data_dict
 from app.core.graph.state import StockData
+from app.services.io_pool import IO_POOL
 
-# Thread pool for running sync yfinance calls
-_executor = ThreadPoolExecutor(max_workers=4)
 
-
-async def get_stock_data(ticker: str, period: str = "2y") -> StockData | None:
+async def get_stock_data(
+    ticker: str, period: str = "2y", fields: StockFields = StockFields.ALL
+) -> StockData | None:
     """
     Fetch stock data asynchronously.
 
     Args:
         ticker: Stock ticker with exchange suffix
         period: Historical data period
+        fields: Optional parts to fetch; skipped ones keep their defaults
 
     Returns:
         StockData object or None if error
     """
-    loop = asyncio.get_event_loop()
-    json_str = await loop.run_in_executor(
-        _executor,
-        fetch_stock_data_sync,
+    loop = asyncio.get_running_loop()
+    # The dict is used directly; no JSON round-trip
+    data = await loop.run_in_executor(
+        IO_POOL,
+        fetch_stock_data_dict,
         ticker,
         period,
+        fields,
     )
 
-    data = parse_stock_data(json_str)
-
     if "error" in data:
         return None
 
@@ -45,7 +46,7 @@ async def get_stock_data(ticker: str, period: str = "2y") -> StockData | None:
         fifty_two_week_low=data.get("fifty_two_week_low", 0.0),
         sector=data.get("sector"),
         industry=data.get("industry"),
-        historical_prices=data.get("historical_prices", []),
+        historical_prices=data.get("historical_prices", {}),
         # Shareholding
         promoter_holding=data.get("promoter_holding"),
         fii_holding=data.get("fii_holding"),
@@ -72,6 +73,7 @@ async def get_stock_data(ticker: str, period: str = "2y") -> StockData | None:
     )
 
 
+@lru_cache(maxsize=1024)
 def format_ticker(ticker: str, exchange: str = "NSE") -> str:
     """
     Format ticker with exchange suffix.
@@ -0,0 +1,60 @@
+"""CrewAI tool wrappers around the data fetchers."""
+
+# Kept apart from the fetcher modules so services can import those without
+# pulling in crewai; only the agents load this module, on first use.
+
+from functools import lru_cache
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel
+
+from app.tools.search_tool import SearchInput, search_news_sync
+from app.tools.yfinance_tool import YFinanceInput, fetch_stock_data_sync
+
+
+class YFinanceTool(BaseTool):
+    """CrewAI tool for fetching stock data via yfinance."""
+
+    name: str = "Stock Data Fetcher"
+    description: str = """
+    Fetches comprehensive stock data including:
+    - Current price and price change
+    - Key fundamentals (P/E, Market Cap, etc.)
+    - Historical price data
+    - Volume information
+    Use for NSE India stocks by appending .NS (e.g., TATASTEEL.NS, RELIANCE.NS)
+    Use for BSE India stocks by appending .BO (e.g., TATASTEEL.BO)
+    """
+    args_schema: type[BaseModel] = YFinanceInput
+
+    def _run(self, ticker: str, period: str = "2y") -> str:
+        """Fetch stock data synchronously."""
+        return fetch_stock_data_sync(ticker, period)
+
+
+class SearchTool(BaseTool):
+    """CrewAI tool for DuckDuckGo news search."""
+
+    name: str = "News Search"
+    description: str = """
+    Searches for recent news articles about stocks, companies, or markets.
+    Returns news headlines, snippets, sources, and publication dates.
+    Use for gathering sentiment and recent developments about a stock.
+    """
+    args_schema: type[BaseModel] = SearchInput
+
+    def _run(self, query: str, max_results: int = 10) -> str:
+        """Search for news synchronously."""
+        return search_news_sync(query, max_results)
+
+
+@lru_cache(maxsize=1)
+def get_yfinance_tool() -> YFinanceTool:
+    """Get the YFinanceTool instance shared by all agents."""
+    return YFinanceTool()
+
+
+@lru_cache(maxsize=1)
+def get_search_tool() -> SearchTool:
+    """Get the SearchTool instance shared by all agents."""
+    return SearchTool()
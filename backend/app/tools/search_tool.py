@@ -1,10 +1,14 @@
 """DuckDuckGo search tool for fetching news."""
 
-import json
-from crewai.tools import BaseTool
+import time
+from functools import lru_cache
+import orjson
 from pydantic import BaseModel, Field
 from duckduckgo_search import DDGS
 
+# How long a query's results are reused
+_NEWS_TTL_SECONDS = 600
+
 
 class SearchInput(BaseModel):
     """Input schema for search tool."""
@@ -13,26 +17,12 @@ class SearchInput(BaseModel):
     max_results: int = Field(default=10, description="Maximum number of results")
 
 
-class SearchTool(BaseTool):
-    """CrewAI tool for DuckDuckGo news search."""
-
-    name: str = "News Search"
-    description: str = """
-    Searches for recent news articles about stocks, companies, or markets.
-    Returns news headlines, snippets, sources, and publication dates.
-    Use for gathering sentiment and recent developments about a stock.
-    """
-    args_schema: type[BaseModel] = SearchInput
-
-    def _run(self, query: str, max_results: int = 10) -> str:
-        """Search for news synchronously."""
-        return search_news_sync(query, max_results)
-
-
 def search_news_sync(query: str, max_results: int = 10) -> str:
     """
     Search for news using DuckDuckGo.
 
+    Results are reused for up to _NEWS_TTL_SECONDS per query.
+
     Args:
         query: Search query
         max_results: Maximum number of results
@@ -41,42 +31,48 @@ def search_news_sync(query: str, max_results: int = 10) -> str:
         JSON string with news items
     """
     try:
-        with DDGS() as ddgs:
-            # Note: DuckDuckGo supports: d (day), w (week), m (month)
-            # Limit to last 2 months (60 days) for recent news only
-            results = list(
-                ddgs.news(
-                    query,
-                    region="in-en",  # India English
-                    safesearch="moderate",
-                    timelimit="m",  # Last month - will be further filtered to 60 days
-                    max_results=max_results,
-                )
-            )
-
-        news_items = [
-            {
-                "title": item.get("title", ""),
-                "snippet": item.get("body", ""),
-                "source": item.get("source", ""),
-                "url": item.get("url", ""),
-                "date": item.get("date", ""),
-            }
-            for item in results
-        ]
-
-        return json.dumps(news_items, indent=2)
-
+        return _cached_news(query, max_results, int(time.monotonic() // _NEWS_TTL_SECONDS))
     except Exception as e:
-        return json.dumps({"error": str(e), "query": query})
+        return orjson.dumps({"error": str(e), "query": query}).decode()
+
+
+@lru_cache(maxsize=256)
+def _cached_news(query: str, max_results: int, ttl_bucket: int) -> str:
+    """Run a DuckDuckGo news search (cached per TTL bucket; errors aren't cached)."""
+    # Note: DuckDuckGo supports: d (day), w (week), m (month)
+    # Limit to last 2 months (60 days) for recent news only
+    # DDGS keeps unsynchronized rate-limit and cookie state, so searches from
+    # concurrent worker threads each get their own client
+    with DDGS() as ddgs:
+        results = ddgs.news(
+            query,
+            region="in-en",  # India English
+            safesearch="moderate",
+            timelimit="m",  # Last month - will be further filtered to 60 days
+            max_results=max_results,
+        )
+
+    # Every field is a string (missing or null values become "")
+    news_items = [
+        {
+            "title": item.get("title") or "",
+            "snippet": item.get("body") or "",
+            "source": item.get("source") or "",
+            "url": item.get("url") or "",
+            "date": item.get("date") or "",
+        }
+        for item in results
+    ]
+
+    return orjson.dumps(news_items).decode()
 
 
 def parse_news_data(json_str: str) -> list[dict]:
     """Parse news data JSON string to list of dictionaries."""
     try:
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         if isinstance(data, dict) and "error" in data:
             return []
         return data if isinstance(data, list) else []
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return []
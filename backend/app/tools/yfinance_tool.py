@@ -1,15 +1,75 @@
 """YFinance tool for fetching stock data."""
 
 import ssl
-import json
+import time
+from enum import IntFlag
+from functools import lru_cache
 from typing import Any
+import orjson
 import yfinance as yf
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
 # Bypass SSL verification (per user preference)
 ssl._create_default_https_context = ssl._create_unverified_context
 
+# NaN values (missing yfinance fields) serialize as null
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+# How long a ticker's downloaded data is reused
+_STOCK_TTL_SECONDS = 300
+
+# Result fields copied as-is from yfinance .info: (result key, info key, default)
+_INFO_FIELDS = (
+    ("previous_close", "previousClose", None),
+    ("price_change_percent", "regularMarketChangePercent", 0),
+    ("volume", "volume", 0),
+    ("market_cap", "marketCap", None),
+    ("pe_ratio", "trailingPE", None),
+    ("forward_pe", "forwardPE", None),
+    ("dividend_yield", "dividendYield", None),
+    ("fifty_two_week_high", "fiftyTwoWeekHigh", None),
+    ("fifty_two_week_low", "fiftyTwoWeekLow", None),
+    ("fifty_day_average", "fiftyDayAverage", None),
+    ("two_hundred_day_average", "twoHundredDayAverage", None),
+    ("sector", "sector", None),
+    ("industry", "industry", None),
+    ("beta", "beta", None),
+    ("book_value", "bookValue", None),
+    ("eps", "trailingEps", None),
+    ("pb_ratio", "priceToBook", None),
+    ("debt_to_equity", "debtToEquity", None),
+    ("roe", "returnOnEquity", None),
+    ("target_price", "targetMeanPrice", None),
+)
+
+
+def _holder_kind(label: object) -> str | None:
+    """
+    Classify a major_holders row label.
+
+    Args:
+        label: Row label, e.g. "insidersPercentHeld"
+
+    Returns:
+        "insider", "institution", or None for rows that aren't used
+    """
+    label = str(label).lower().replace(' ', '')
+    if 'insider' in label:
+        return "insider"
+    if 'institutionspercent' in label and 'float' not in label:
+        return "institution"
+    return None
+
+
+class StockFields(IntFlag):
+    """Optional parts of the stock data, each costing an extra yfinance request."""
+
+    PRICE = 0  # quote, key statistics and price history are always fetched
+    HOLDERS = 1
+    RECOMMENDATIONS = 2
+    FINANCIALS = 4
+    ALL = HOLDERS | RECOMMENDATIONS | FINANCIALS
+
 
 class YFinanceInput(BaseModel):
     """Input schema for YFinance tool."""
@@ -24,87 +84,85 @@ class YFinanceInput(BaseModel):
     )
 
 
-class YFinanceTool(BaseTool):
-    """CrewAI tool for fetching stock data via yfinance."""
-
-    name: str = "Stock Data Fetcher"
-    description: str = """
-    Fetches comprehensive stock data including:
-    - Current price and price change
-    - Key fundamentals (P/E, Market Cap, etc.)
-    - Historical price data
-    - Volume information
-    Use for NSE India stocks by appending .NS (e.g., TATASTEEL.NS, RELIANCE.NS)
-    Use for BSE India stocks by appending .BO (e.g., TATASTEEL.BO)
+def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
     """
-    args_schema: type[BaseModel] = YFinanceInput
+    Fetch stock data from yfinance as JSON (for the CrewAI tool).
 
-    def _run(self, ticker: str, period: str = "2y") -> str:
-        """Fetch stock data synchronously."""
-        return fetch_stock_data_sync(ticker, period)
+    Args:
+        ticker: Stock ticker with exchange suffix (.NS or .BO)
+        period: Historical data period
 
+    Returns:
+        JSON string with stock data
+    """
+    return orjson.dumps(fetch_stock_data_dict(ticker, period), option=_ORJSON_OPTS).decode()
 
-def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
+
+def fetch_stock_data_dict(
+    ticker: str, period: str = "2y", fields: StockFields = StockFields.ALL
+) -> dict[str, Any]:
     """
     Fetch stock data from yfinance.
 
+    Results are reused for up to _STOCK_TTL_SECONDS, so repeat lookups of a
+    ticker (e.g. agent tool calls during one debate) skip the download.
+    Treat the returned dict as read-only.
+
     Args:
         ticker: Stock ticker with exchange suffix (.NS or .BO)
         period: Historical data period
+        fields: Optional parts to fetch (shareholding, analyst
+            recommendations, quarterly financials)
 
     Returns:
-        JSON string with stock data
+        Dictionary with stock data, or with an "error" key on failure
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        hist = stock.history(period=period)
-
-        if hist.empty:
-            return json.dumps({"error": f"No data found for ticker: {ticker}"})
-
-        # Basic data
-        result = {
-            "ticker": ticker,
-            "company_name": info.get("longName") or info.get("shortName"),
-            "current_price": info.get("currentPrice") or info.get("regularMarketPrice"),
-            "previous_close": info.get("previousClose"),
-            "price_change_percent": info.get("regularMarketChangePercent", 0),
-            "volume": info.get("volume", 0),
-            "market_cap": info.get("marketCap"),
-            "pe_ratio": info.get("trailingPE"),
-            "forward_pe": info.get("forwardPE"),
-            "dividend_yield": info.get("dividendYield"),
-            "fifty_two_week_high": info.get("fiftyTwoWeekHigh"),
-            "fifty_two_week_low": info.get("fiftyTwoWeekLow"),
-            "fifty_day_average": info.get("fiftyDayAverage"),
-            "two_hundred_day_average": info.get("twoHundredDayAverage"),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "historical_prices": [
-                {
-                    "date": str(date.date()),
-                    "open": round(row["Open"], 2),
-                    "high": round(row["High"], 2),
-                    "low": round(row["Low"], 2),
-                    "close": round(row["Close"], 2),
-                    "volume": int(row["Volume"]),
-                }
-                for date, row in hist.iterrows()
-            ],
-        }
-
-        # Key statistics
-        result["beta"] = info.get("beta")
-        result["book_value"] = info.get("bookValue")
-        result["eps"] = info.get("trailingEps")
-        result["pb_ratio"] = info.get("priceToBook")
-        result["debt_to_equity"] = info.get("debtToEquity")
-        result["roe"] = info.get("returnOnEquity")
-        if result["roe"]:
-            result["roe"] = result["roe"] * 100  # Convert to percentage
-
-        # Shareholding pattern (from major holders)
+        return _cached_stock_data(
+            ticker, period, fields, int(time.monotonic() // _STOCK_TTL_SECONDS)
+        )
+    except Exception as e:
+        return {"error": str(e), "ticker": ticker}
+
+
+@lru_cache(maxsize=256)
+def _cached_stock_data(
+    ticker: str, period: str, fields: StockFields, ttl_bucket: int
+) -> dict[str, Any]:
+    """Download stock data (cached per TTL bucket; errors aren't cached)."""
+    stock = yf.Ticker(ticker)
+    info = stock.info
+    hist = stock.history(period=period)
+
+    if hist.empty:
+        raise ValueError(f"No data found for ticker: {ticker}")
+
+    # Basic data and key statistics
+    result = {
+        "ticker": ticker,
+        "company_name": info.get("longName") or info.get("shortName"),
+        "current_price": info.get("currentPrice") or info.get("regularMarketPrice"),
+    }
+    for key, info_key, default in _INFO_FIELDS:
+        result[key] = info.get(info_key, default)
+    if result["roe"]:
+        result["roe"] = result["roe"] * 100  # Convert to percentage
+
+    # Price history as parallel columns (one list per field, not a dict
+    # per day), each rounded/formatted in one vectorized call
+    # (tolist() also yields plain Python floats and ints)
+    prices = hist[["Open", "High", "Low", "Close"]].round(2)
+    result["historical_prices"] = {
+        "date": hist.index.strftime("%Y-%m-%d").tolist(),
+        "open": prices["Open"].tolist(),
+        "high": prices["High"].tolist(),
+        "low": prices["Low"].tolist(),
+        "close": prices["Close"].tolist(),
+        "volume": hist["Volume"].astype("int64").tolist(),
+    }
+
+    # Shareholding pattern (from major holders)
+    if fields & StockFields.HOLDERS:
         try:
             holders = stock.major_holders
             if holders is not None and not holders.empty:
@@ -113,15 +171,17 @@ def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
 
                 # New yfinance format: index is breakdown name, 'Value' column has the value
                 for idx in holders.index:
-                    idx_lower = str(idx).lower()
+                    kind = _holder_kind(idx)
+                    if kind is None:
+                        continue
                     value = holders.loc[idx, 'Value'] if 'Value' in holders.columns else holders.loc[idx].iloc[0]
                     if isinstance(value, (int, float)):
-                        value = float(value) * 100  # Convert to percentage
-                        if 'insider' in idx_lower:
-                            insider_pct = round(value, 2)
+                        value = round(float(value) * 100, 2)  # Convert to percentage
+                        if kind == "insider":
+                            insider_pct = value
                             result["promoter_holding"] = insider_pct
-                        elif 'institutionspercent' in idx_lower.replace(' ', '') and 'float' not in idx_lower:
-                            institution_pct = round(value, 2)
+                        else:
+                            institution_pct = value
 
                 # Split institutions roughly into FII and DII (approximation)
                 # Typically for Indian stocks, FIIs are ~60-70% of institutional holdings
@@ -137,7 +197,8 @@ def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
         except Exception:
             pass
 
-        # Analyst recommendations
+    # Analyst recommendations
+    if fields & StockFields.RECOMMENDATIONS:
         try:
             recs = stock.recommendations
             if recs is not None and not recs.empty:
@@ -153,10 +214,8 @@ def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
         except Exception:
             pass
 
-        # Target price
-        result["target_price"] = info.get("targetMeanPrice")
-
-        # Quarterly financials
+    # Quarterly financials
+    if fields & StockFields.FINANCIALS:
         try:
             financials = stock.quarterly_financials
             if financials is not None and not financials.empty:
@@ -182,15 +241,4 @@ def fetch_stock_data_sync(ticker: str, period: str = "2y") -> str:
         except Exception:
             pass
 
-        return json.dumps(result, indent=2)
-
-    except Exception as e:
-        return json.dumps({"error": str(e), "ticker": ticker})
-
-
-def parse_stock_data(json_str: str) -> dict[str, Any]:
-    """Parse stock data JSON string to dictionary."""
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
-        return {"error": "Failed to parse stock data"}
+    return result
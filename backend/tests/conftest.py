@@ -0,0 +1,8 @@
+"""Shared test setup."""
+
+import os
+
+# Settings are read at import; keep tests offline and off the on-disk cache
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ["LLM_CACHE_MODE"] = "disabled"
+os.environ["TICKER_TAPE_SNAPSHOT_PATH"] = ""
@@ -0,0 +1,33 @@
+"""Tests for the shared agent prompt helpers."""
+
+from app.core.agents.base import format_stock_data
+from app.core.graph.state import StockData
+
+
+def test_format_stock_data_keeps_zeros_and_drops_missing():
+    text = format_stock_data(
+        StockData(ticker="TEST.NS", current_price=100.0, dividend_yield=0.0, analyst_buy=2)
+    )
+
+    assert text == (
+        "CURRENT STOCK DATA:\n"
+        "- Company: TEST.NS\n"
+        "- Current Price: Rs. 100.0\n"
+        "- Price Change: 0.00%\n"
+        "- 52-Week Range: Rs. 0.0 - Rs. 0.0\n"
+        "\n"
+        "FUNDAMENTALS:\n"
+        "- Dividend Yield: 0.0%\n"
+        "\n"
+        "ANALYST CONSENSUS:\n"
+        "- Buy: 2, Hold: 0, Sell: 0"
+    )
+
+
+def test_format_stock_data_uses_company_name():
+    text = format_stock_data(
+        StockData(ticker="TEST.NS", company_name="Test Ltd", current_price=1.0, pe_ratio=12.5)
+    )
+
+    assert text.startswith("CURRENT STOCK DATA:\n- Company: Test Ltd\n")
+    assert "- P/E Ratio: 12.5\n" in text
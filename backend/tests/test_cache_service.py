@@ -0,0 +1,122 @@
+"""Tests for the ticker tape's Yahoo fetch path."""
+
+import asyncio
+
+import httpx
+import orjson
+import pandas as pd
+
+from app.services import cache_service
+from app.services.cache_service import NIFTY_50_SYMBOLS, TickerTapeCache, _download_stock_data
+
+
+class _FakeYahoo:
+    """Mock Yahoo host: cookie, crumb, batched quote and chart endpoints."""
+
+    def __init__(self, quote_status: int = 200):
+        self.quote_status = quote_status
+        self.quote_crumbs: list[str | None] = []
+        self.crumbs_issued = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        if url.host == "fc.yahoo.com":
+            return httpx.Response(404, headers={"set-cookie": "A3=session; Domain=.yahoo.com"})
+        if url.path == "/v1/test/getcrumb":
+            if "A3=session" not in request.headers.get("cookie", ""):
+                return httpx.Response(403)
+            self.crumbs_issued += 1
+            return httpx.Response(200, text=f"crumb{self.crumbs_issued}")
+        if url.path == "/v7/finance/quote":
+            self.quote_crumbs.append(url.params.get("crumb"))
+            if self.quote_status != 200:
+                return httpx.Response(
+                    self.quote_status,
+                    content=b'{"finance":{"error":{"code":"Unauthorized","description":"Invalid Crumb"}}}',
+                )
+            quotes = [
+                {
+                    "symbol": f"{symbol}.NS",
+                    "regularMarketPrice": 110.0,
+                    "regularMarketPreviousClose": 100.0,
+                    "shortName": f"{symbol} Quote Ltd",
+                }
+                for symbol in url.params["symbols"].removesuffix(".NS").split(".NS,")
+            ]
+            return httpx.Response(
+                200, content=orjson.dumps({"quoteResponse": {"result": quotes}})
+            )
+        if url.path.startswith("/v8/finance/chart/"):
+            symbol = url.path.rsplit("/", 1)[-1]
+            chart = {
+                "meta": {"symbol": symbol, "shortName": f"{symbol.removesuffix('.NS')} Chart Ltd"},
+                "indicators": {"quote": [{"close": [200.0, 210.0]}]},
+            }
+            return httpx.Response(
+                200, content=orjson.dumps({"chart": {"result": [chart]}})
+            )
+        return httpx.Response(404)
+
+
+def _refresh(yahoo: _FakeYahoo) -> dict:
+    """Run one ticker tape refresh against the mock host."""
+    cache = TickerTapeCache(snapshot_path=None)
+
+    async def run() -> dict:
+        cache._client = httpx.AsyncClient(transport=httpx.MockTransport(yahoo))
+        try:
+            return await cache.get_ticker_tape_data()
+        finally:
+            await cache._client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_quote_request_carries_crumb():
+    yahoo = _FakeYahoo()
+
+    data = _refresh(yahoo)
+
+    assert yahoo.quote_crumbs == ["crumb1"]
+    assert data["count"] == len(NIFTY_50_SYMBOLS)
+    assert data["tickers"][0] == {
+        "symbol": "RELIANCE",
+        "price": 110.0,
+        "change": 10.0,
+        "name": "RELIANCE Quote Ltd",
+    }
+
+
+def test_invalid_crumb_falls_back_to_charts():
+    yahoo = _FakeYahoo(quote_status=401)
+
+    data = _refresh(yahoo)
+
+    # One retry with a fresh crumb, then the per-symbol chart fallback
+    assert yahoo.quote_crumbs == ["crumb1", "crumb2"]
+    assert data["count"] == len(NIFTY_50_SYMBOLS)
+    assert data["tickers"][0] == {
+        "symbol": "RELIANCE",
+        "price": 210.0,
+        "change": 5.0,
+        "name": "RELIANCE Chart Ltd",
+    }
+
+
+def test_download_looks_up_only_unnamed_symbols(monkeypatch):
+    columns = pd.MultiIndex.from_product([["TCS.NS", "INFY.NS"], ["Close"]])
+    frame = pd.DataFrame([[100.0, 50.0], [110.0, 55.0]], columns=columns)
+    looked_up = []
+
+    def short_name(symbol):
+        looked_up.append(symbol)
+        return f"{symbol} Ltd"
+
+    monkeypatch.setattr(cache_service.yf, "download", lambda *args, **kwargs: frame)
+    monkeypatch.setattr(cache_service, "_short_name", short_name)
+
+    rows = _download_stock_data(["TCS", "INFY", "ITC"], frozenset({"INFY", "ITC"}))
+
+    assert looked_up == ["INFY"]
+    assert [row and row["name"] for row in rows] == ["TCS", "INFY Ltd", None]
+    assert (rows[1]["price"], rows[1]["change"]) == (55.0, 10.0)
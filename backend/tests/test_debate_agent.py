@@ -0,0 +1,52 @@
+"""Tests for parsing debate agent answers."""
+
+import pytest
+
+from app.core.agents.debate_agent import PERSONAS, DebateAgent
+
+
+@pytest.fixture
+def agent():
+    """Bull agent without its CrewAI agent or LLM."""
+    bull = DebateAgent.__new__(DebateAgent)
+    bull.stance = "bull"
+    bull.persona = PERSONAS["bull"]
+    return bull
+
+
+def test_parse_result(agent):
+    analysis = agent._parse_result(
+        '{"summary": "Strong case", "arguments": [{"point": "P", "evidence": "E",'
+        ' "confidence": 1.4}], "confidence_score": "0.8"}',
+        [],
+    )
+
+    assert analysis.summary == "Strong case"
+    assert (analysis.arguments[0].point, analysis.arguments[0].evidence) == ("P", "E")
+    assert analysis.arguments[0].confidence == 1.0
+    assert analysis.confidence_score == 0.8
+
+
+def test_parse_result_replaces_non_string_text(agent):
+    analysis = agent._parse_result(
+        '{"summary": null, "arguments": [{"point": 3, "evidence": null}]}', []
+    )
+
+    assert analysis.summary == PERSONAS["bull"]["default_summary"]
+    assert (analysis.arguments[0].point, analysis.arguments[0].evidence) == ("", "")
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        '{"summary": "S", "confidence_score": null}',
+        '{"summary": "S", "confidence_score": "high"}',
+        '{"summary": "S", "arguments": [{"point": "P", "confidence": null}]}',
+    ],
+)
+def test_parse_result_falls_back_on_bad_confidence(agent, answer):
+    analysis = agent._parse_result(answer, [])
+
+    assert analysis.summary == answer
+    assert analysis.confidence_score == 0.6
+    assert analysis.arguments[0].point == "See detailed analysis"
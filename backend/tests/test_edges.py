@@ -0,0 +1,170 @@
+"""Tests for the debate graph routing."""
+
+import asyncio
+
+import pytest
+from langgraph.graph import END
+
+from app.config import settings
+from app.core.graph import nodes
+from app.core.graph.builder import build_debate_graph
+from app.core.graph.edges import (
+    route_after_bull,
+    route_after_fetch,
+    route_after_fused,
+    route_after_round,
+)
+from app.core.graph.state import AgentAnalysis, NewsItem, StockData, create_initial_state
+
+FLAGS = [(fused, parallel) for fused in (True, False) for parallel in (True, False)]
+
+
+@pytest.fixture
+def flags(monkeypatch):
+    """Set FUSED_SINGLE_ROUND / PARALLEL_FIRST_ROUND for one test."""
+
+    def set_flags(fused: bool, parallel: bool) -> None:
+        monkeypatch.setattr(settings, "fused_single_round", fused)
+        monkeypatch.setattr(settings, "parallel_first_round", parallel)
+
+    return set_flags
+
+
+def _state(**overrides) -> dict:
+    state = create_initial_state("TEST.NS")
+    state["stock_data"] = StockData(ticker="TEST.NS", current_price=100.0)
+    state.update(overrides)
+    return state
+
+
+def _analysis(agent: str, confidence: float = 0.6) -> AgentAnalysis:
+    return AgentAnalysis(
+        agent_type=agent,
+        summary=f"{agent} case",
+        confidence_score=confidence,
+        recommendation="BUY" if agent == "moderator" else None,
+    )
+
+
+def test_route_after_fetch_error():
+    assert route_after_fetch(_state(stock_data=None)) == "error_handler"
+    assert route_after_fetch(_state(error="boom")) == "error_handler"
+
+
+@pytest.mark.parametrize("fused,parallel", FLAGS)
+@pytest.mark.parametrize("max_rounds", [1, 3])
+def test_route_after_fetch(flags, fused, parallel, max_rounds):
+    flags(fused, parallel)
+    route = route_after_fetch(_state(max_rounds=max_rounds))
+
+    if fused and max_rounds == 1:
+        assert route == ["summary", "fused_debate"]
+    elif parallel:
+        assert route == ["summary", "bull_analysis", "bear_analysis"]
+    else:
+        assert route == ["summary", "bull_analysis"]
+
+
+@pytest.mark.parametrize("fused,parallel", FLAGS)
+def test_route_after_fused(flags, fused, parallel):
+    flags(fused, parallel)
+    assert route_after_fused(_state(moderator_analysis=_analysis("moderator"))) == END
+
+    # Unparsed fused answer: same opening round as route_after_fetch
+    fallback = route_after_fused(_state())
+    if parallel:
+        assert fallback == ["bull_analysis", "bear_analysis"]
+    else:
+        assert fallback == "bull_analysis"
+
+
+@pytest.mark.parametrize("fused,parallel", FLAGS)
+@pytest.mark.parametrize("current_round", [1, 2])
+def test_route_after_bull(flags, fused, parallel, current_round):
+    flags(fused, parallel)
+    route = route_after_bull(_state(current_round=current_round))
+
+    if parallel and current_round == 1:
+        assert route == "round_complete"
+    else:
+        assert route == "bear_analysis"
+
+
+def test_route_after_round():
+    assert route_after_round(_state(phase="bull_analyzing")) == "bull_analysis"
+
+    close_call = _state(
+        phase="moderating",
+        bull_analysis=_analysis("bull", 0.6),
+        bear_analysis=_analysis("bear", 0.6),
+    )
+    assert route_after_round(close_call) == "moderator"
+
+
+class _FakeDebateAgent:
+    def __init__(self, agent_type: str):
+        self.agent_type = agent_type
+
+    async def analyze(self, round_number: int = 1, **kwargs) -> AgentAnalysis:
+        await asyncio.sleep(0)
+        return _analysis(self.agent_type)
+
+
+class _FakeModerator:
+    async def synthesize_stream(self, **kwargs):
+        yield "verdict"
+
+    def build_verdict(self, text: str, **kwargs) -> AgentAnalysis:
+        return _analysis("moderator")
+
+    def fast_verdict(self, **kwargs) -> AgentAnalysis:
+        return _analysis("moderator")
+
+
+class _FakeSummary:
+    async def generate_summary(self, **kwargs) -> dict:
+        return {}
+
+
+class _UnparsedFused:
+    async def debate(self, **kwargs):
+        return None
+
+
+@pytest.fixture
+def stub_nodes(monkeypatch):
+    """Replace the data fetchers and agents the nodes call with stubs."""
+
+    async def get_stock_data(ticker, *args, **kwargs):
+        return StockData(ticker=ticker, current_price=100.0)
+
+    async def search_news(*args, **kwargs):
+        return [NewsItem(title="TEST news", snippet="", source="", url="u", date="")]
+
+    async def fetch_market_indices():
+        return {"indices": []}
+
+    monkeypatch.setattr(nodes, "get_stock_data", get_stock_data)
+    monkeypatch.setattr(nodes, "search_news", search_news)
+    monkeypatch.setattr(nodes, "fetch_market_indices", fetch_market_indices)
+    monkeypatch.setattr(nodes, "get_debate_agent", _FakeDebateAgent)
+    monkeypatch.setattr(nodes, "get_moderator_agent", _FakeModerator)
+    monkeypatch.setattr(nodes, "get_summary_agent", _FakeSummary)
+    monkeypatch.setattr(nodes, "get_fused_debate_agent", _UnparsedFused)
+
+
+@pytest.mark.parametrize("fused,parallel", FLAGS)
+@pytest.mark.parametrize("max_rounds", [1, 2])
+def test_graph_runs_every_flag_combination(flags, stub_nodes, fused, parallel, max_rounds):
+    flags(fused, parallel)
+    graph = build_debate_graph()
+
+    final = asyncio.run(graph.ainvoke(create_initial_state("TEST.NS", max_rounds=max_rounds)))
+
+    assert final["phase"] == "complete"
+    assert final["moderator_analysis"] is not None
+    # One bull and one bear entry per round, then the verdict
+    roles = [entry["role"] for entry in final["debate_history"]]
+    assert roles.count("bull") == max_rounds
+    assert roles.count("bear") == max_rounds
+    assert roles[-1] == "moderator"
@@ -0,0 +1,68 @@
+"""Tests for news date and relevance filtering."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.graph.state import NewsItem
+from app.services.news_service import (
+    _is_recent_news,
+    _relevance_matcher,
+    filter_relevant_news,
+)
+
+CUTOFF = "2026-08-16"
+DAY_BEFORE = (date.fromisoformat(CUTOFF) - timedelta(days=1)).isoformat()
+
+
+@pytest.mark.parametrize(
+    ("date_str", "recent"),
+    [
+        (f"{CUTOFF}T00:00:00+00:00", True),
+        (f"{CUTOFF}T00:00:00Z", True),
+        (f"{CUTOFF}T00:00:00", True),
+        ("2026-10-14T09:30:00Z", True),
+        (f"{DAY_BEFORE}T23:59:59Z", False),
+        (f"{DAY_BEFORE}T23:59:59", False),
+        # Already the cutoff day in UTC, although the local date is earlier
+        (f"{DAY_BEFORE}T22:00:00-05:00", True),
+        # Still the day before in UTC, although the local date is the cutoff
+        (f"{CUTOFF}T01:00:00+05:30", False),
+        ("", False),
+        ("yesterday", False),
+        ("2026-13-45T00:00:00Z", False),
+    ],
+)
+def test_is_recent_news(date_str, recent):
+    assert _is_recent_news(date_str, CUTOFF) is recent
+
+
+def test_relevance_matcher_strips_suffixes():
+    matcher = _relevance_matcher("TATASTEEL.NS", "Tata Steel Limited")
+
+    assert matcher.clean_ticker == "tatasteel"
+    assert matcher.company == "tata steel"
+    assert matcher.matches("tatasteel shares rally")
+    assert matcher.matches("tata steel posts record output")
+    # First significant word, on word boundaries only
+    assert matcher.matches("tata group expands")
+    assert not matcher.matches("tatami mats in demand")
+    assert not matcher.matches("sensex closes higher")
+
+
+def test_relevance_matcher_skips_short_or_generic_first_words():
+    assert _relevance_matcher("ITC.NS", "ITC Ltd").first_word is None
+    assert _relevance_matcher("IOC.NS", "Indian Oil Corporation").first_word is None
+    assert _relevance_matcher("INFY.BO").first_word is None
+
+
+def test_filter_relevant_news_keeps_order():
+    items = [
+        NewsItem(title="Infosys wins deal", snippet="", source="A", url="", date=""),
+        NewsItem(title="Markets close flat", snippet="", source="B", url="", date=""),
+        NewsItem(title="IT stocks", snippet="", source="C", url="https://x.test/infy-q2", date=""),
+    ]
+
+    relevant = filter_relevant_news(items, "INFY.NS", "Infosys Limited")
+
+    assert [item.source for item in relevant] == ["A", "C"]
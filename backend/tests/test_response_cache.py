@@ -0,0 +1,178 @@
+"""Tests for the LLM response cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.agents import response_cache
+from app.core.agents.base import response_format
+from app.core.agents.response_cache import (
+    LLMCacheMiss,
+    LLMResponseCache,
+    cache_key,
+    execute_task_cached,
+    stream_completion_cached,
+)
+
+LLM = SimpleNamespace(model="gpt-4o-mini", temperature=0.7)
+
+
+class _Verdict(BaseModel):
+    recommendation: str
+
+
+class _FakeTask:
+    """CrewAI Task stand-in that counts live executions."""
+
+    def __init__(self, description: str = "prompt", expected_output: str = "JSON"):
+        self.description = description
+        self.expected_output = expected_output
+        self.agent = SimpleNamespace(role="Bull", goal="Argue", backstory="Analyst")
+        self.calls = 0
+
+    def execute_sync(self) -> str:
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+@pytest.fixture
+def use_cache(monkeypatch, tmp_path):
+    """Swap in a fresh on-disk cache with the given mode."""
+
+    def make(mode: str) -> LLMResponseCache:
+        cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), mode=mode)
+        monkeypatch.setattr(response_cache, "llm_response_cache", cache)
+        return cache
+
+    return make
+
+
+def test_cache_key_is_deterministic():
+    assert cache_key("sys", "prompt", "m", 0.7) == cache_key("sys", "prompt", "m", 0.7)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        # Boundaries between inputs can't shift without changing the key
+        ("", "sysprompt", "m", 0.7, None),
+        ("sys", "promptm", "", 0.7, None),
+        # Every input takes part
+        ("other", "prompt", "m", 0.7, None),
+        ("sys", "prompt", "other", 0.7, None),
+        ("sys", "prompt", "m", 0.9, None),
+        ("sys", "prompt", "m", None, None),
+        ("sys", "prompt", "m", 0.7, response_format(json_mode=True)),
+        ("sys", "prompt", "m", 0.7, response_format(response_model=_Verdict)),
+    ],
+)
+def test_cache_key_distinguishes_inputs(other):
+    assert cache_key("sys", "prompt", "m", 0.7, None) != cache_key(*other)
+
+
+def test_unknown_mode_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LLMResponseCache(str(tmp_path / "cache.sqlite3"), mode="sometimes")
+
+
+def test_enabled_mode_stores_and_hits(use_cache):
+    use_cache("enabled")
+    task = _FakeTask()
+
+    assert execute_task_cached(task, LLM) == "reply 1"
+    assert execute_task_cached(task, LLM) == "reply 1"
+    assert task.calls == 1
+
+
+def test_expected_output_is_part_of_the_key(use_cache):
+    use_cache("enabled")
+
+    assert execute_task_cached(_FakeTask(expected_output="JSON"), LLM) == "reply 1"
+    assert execute_task_cached(_FakeTask(expected_output="Text"), LLM) == "reply 1"
+    assert execute_task_cached(_FakeTask(expected_output="JSON"), LLM) == "reply 1"
+
+
+def test_read_only_mode_never_stores(use_cache):
+    cache = use_cache("read-only")
+    task = _FakeTask()
+
+    execute_task_cached(task, LLM)
+    execute_task_cached(task, LLM)
+    assert task.calls == 2
+
+    cache.mode = "enabled"
+    cache.set("key", "stored")
+    cache.mode = "read-only"
+    assert cache.get("key") == "stored"
+
+
+def test_replay_mode_serves_hits_and_raises_on_miss(use_cache):
+    cache = use_cache("enabled")
+    recorded = _FakeTask("recorded")
+    execute_task_cached(recorded, LLM)
+
+    cache.mode = "replay"
+    assert execute_task_cached(recorded, LLM) == "reply 1"
+    with pytest.raises(LLMCacheMiss):
+        execute_task_cached(_FakeTask("new"), LLM)
+
+
+def test_replay_mode_ignores_ttl(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=-1)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+    cache.mode = "replay"
+    assert cache.get("key") == "value"
+
+
+def test_disabled_mode_bypasses_cache(use_cache):
+    cache = use_cache("disabled")
+    task = _FakeTask()
+
+    execute_task_cached(task, LLM)
+    execute_task_cached(task, LLM)
+    assert task.calls == 2
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+def test_size_bound_evicts_oldest(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+    assert cache.get("c") == "c"
+
+
+def test_stream_keys_on_system_prompt_and_format(use_cache, monkeypatch):
+    use_cache("enabled")
+    calls = []
+
+    async def fake_stream(system_prompt, prompt, llm, json_mode, response_model):
+        calls.append(system_prompt)
+        for chunk in ("a", "b"):
+            yield chunk
+
+    monkeypatch.setattr(response_cache, "stream_completion", fake_stream)
+
+    async def collect(system_prompt, **kwargs):
+        return [
+            chunk
+            async for chunk in stream_completion_cached(system_prompt, "prompt", LLM, **kwargs)
+        ]
+
+    async def run():
+        assert await collect("bull") == ["a", "b"]
+        # A hit comes back as one chunk
+        assert await collect("bull") == ["ab"]
+        await collect("bear")
+        await collect("bull", json_mode=True)
+        await collect("bull", response_model=_Verdict)
+
+    asyncio.run(run())
+    assert calls == ["bull", "bear", "bull", "bull"]
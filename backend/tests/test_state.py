@@ -0,0 +1,56 @@
+"""Tests for stream update encoding."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import orjson
+
+from app.core.graph.state import StreamUpdate
+
+
+def test_to_json_omits_none_fields():
+    update = StreamUpdate(type="token", agent="moderator", content="Buy")
+
+    assert orjson.loads(update.to_json()) == {
+        "type": "token",
+        "agent": "moderator",
+        "content": "Buy",
+    }
+
+
+def test_to_json_keeps_falsy_values():
+    update = StreamUpdate(type="round_complete", round_number=0, message="", news_items=[])
+
+    assert orjson.loads(update.to_json()) == {
+        "type": "round_complete",
+        "round_number": 0,
+        "message": "",
+        "news_items": [],
+    }
+
+
+def test_to_json_serializes_numpy_and_datetimes():
+    update = StreamUpdate(
+        type="data_fetched",
+        stock_data={
+            "volume": np.int64(1200),
+            "current_price": np.float64(101.5),
+            "closes": np.array([1.0, 2.0]),
+            "naive": datetime(2026, 10, 15, 9, 30),
+            "aware": datetime(2026, 10, 15, 9, 30, tzinfo=timezone.utc),
+        },
+    )
+
+    assert orjson.loads(update.to_json())["stock_data"] == {
+        "volume": 1200,
+        "current_price": 101.5,
+        "closes": [1.0, 2.0],
+        "naive": "2026-10-15T09:30:00+00:00",
+        "aware": "2026-10-15T09:30:00+00:00",
+    }
+
+
+def test_to_json_is_encoded_once():
+    update = StreamUpdate(type="complete", message="Debate complete")
+
+    assert update.to_json() is update.to_json()
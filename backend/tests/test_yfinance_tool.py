@@ -0,0 +1,22 @@
+"""Tests for major_holders label matching."""
+import pytest
+
+from app.tools.yfinance_tool import _holder_kind
+
+
+@pytest.mark.parametrize(
+    ("label", "kind"),
+    [
+        # yfinance 1.x major_holders index
+        ("insidersPercentHeld", "insider"),
+        ("institutionsPercentHeld", "institution"),
+        ("institutionsFloatPercentHeld", None),
+        ("institutionsCount", None),
+        # Spacing and case variants
+        ("Insiders Percent Held", "insider"),
+        ("institutions percent held", "institution"),
+        ("Institutions Float Percent Held", None),
+    ],
+)
+def test_holder_kind(label, kind):
+    assert _holder_kind(label) == kind
@@ -14,6 +14,7 @@ import {
 import { StockData } from '../../types';
 import { EnhancedTooltip } from './EnhancedTooltip';
 import { calculateSMA } from '../../utils/technicalIndicators';
+import { toPriceRows } from '../../utils/priceHistory';
 
 interface PriceChartProps {
   stockData: StockData;
@@ -104,8 +105,13 @@ export function PriceChart({ stockData }: PriceChartProps) {
     sma200: false,
   });
 
+  // Rebuild per-day rows from the API's columns once per stock
+  const prices = useMemo(
+    () => toPriceRows(stockData.historical_prices),
+    [stockData.historical_prices]
+  );
+
   const filteredData = useMemo(() => {
-    const prices = stockData.historical_prices;
     if (!prices.length) return [];
 
     const now = new Date();
@@ -153,7 +159,7 @@ export function PriceChart({ stockData }: PriceChartProps) {
         Price: price.close, // Keep for backward compatibility
       };
     });
-  }, [stockData.historical_prices, selectedRange]);
+  }, [prices, selectedRange]);
 
   const valueFormatter = (value: number) =>
     `₹${value.toLocaleString('en-IN', { maximumFractionDigits: 0 })}`;
@@ -180,7 +186,7 @@ export function PriceChart({ stockData }: PriceChartProps) {
 
   // Calculate technical indicators and merge with filtered data
   const chartDataWithIndicators = useMemo(() => {
-    const fullData = stockData.historical_prices;
+    const fullData = prices;
     if (!fullData.length) return chartDataWithVolumeColor;
 
     const sma20 = enabledIndicators.sma20 ? calculateSMA(fullData, 20) : [];
@@ -196,7 +202,7 @@ export function PriceChart({ stockData }: PriceChartProps) {
         sma200: sma200[smaIndex] || null,
       };
     });
-  }, [stockData.historical_prices, enabledIndicators, chartDataWithVolumeColor, filteredData.length]);
+  }, [prices, enabledIndicators, chartDataWithVolumeColor, filteredData.length]);
 
   return (
     <div className="stock-card p-6" style={{ backgroundColor: '#17181F' }}>
@@ -15,6 +15,7 @@ const createInitialState = (sessionId: string): DebateState => ({
   summaryAnalysis: null,
   bullAnalysis: null,
   bearAnalysis: null,
+  bearRound: 0,
   moderatorAnalysis: null,
   error: null,
 });
@@ -69,7 +70,9 @@ export function useDebate() {
             ...prev,
             summaryAnalysis: update.summary_analysis || null,
             marketData: update.market_data || prev.marketData,
-            phase: 'bull_analyzing',
+            // The summary runs alongside the debate, so it may land after
+            // the agents have already moved the phase on
+            phase: prev.phase === 'summarizing' ? 'bull_analyzing' : prev.phase,
           };
           console.log('[useDebate] New state summaryAnalysis:', newState.summaryAnalysis);
           return newState;
@@ -96,9 +99,14 @@ export function useDebate() {
           const newState = { ...prev };
           if (update.agent === 'bull' && update.analysis) {
             newState.bullAnalysis = update.analysis;
-            newState.phase = 'bear_analyzing';
+            // In a parallel round the bear may already have answered
+            const round = update.round_number || prev.currentRound;
+            if (prev.bearRound !== round) {
+              newState.phase = 'bear_analyzing';
+            }
           } else if (update.agent === 'bear' && update.analysis) {
             newState.bearAnalysis = update.analysis;
+            newState.bearRound = update.round_number || prev.currentRound;
             // Check if more rounds or go to moderator
             if (prev.currentRound < prev.maxRounds) {
               newState.phase = 'bull_analyzing';
@@ -136,6 +144,7 @@ export function useDebate() {
         break;
 
       case 'node_start':
+      case 'token':
       case 'pong':
         // Ignore these
         break;
@@ -196,6 +205,7 @@ export function useDebate() {
         summaryAnalysis: null,
         bullAnalysis: null,
         bearAnalysis: null,
+        bearRound: 0,
         moderatorAnalysis: null,
         error: null,
       }));
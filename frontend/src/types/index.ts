@@ -29,6 +29,16 @@ export interface HistoricalPrice {
   volume: number;
 }
 
+// Price history as sent by the API: parallel columns, one entry per day
+export interface HistoricalPriceColumns {
+  date: string[];
+  open: number[];
+  high: number[];
+  low: number[];
+  close: number[];
+  volume: number[];
+}
+
 export interface StockData {
   ticker: string;
   company_name: string | null;
@@ -41,7 +51,7 @@ export interface StockData {
   fifty_two_week_low: number;
   sector: string | null;
   industry: string | null;
-  historical_prices: HistoricalPrice[];
+  historical_prices: HistoricalPriceColumns;
   // Shareholding pattern
   promoter_holding: number | null;
   fii_holding: number | null;
@@ -130,6 +140,8 @@ export interface DebateState {
   summaryAnalysis: SummaryAnalysis | null;
   bullAnalysis: AgentAnalysis | null;
   bearAnalysis: AgentAnalysis | null;
+  // Round the bear last answered (0 before its first answer)
+  bearRound: number;
   moderatorAnalysis: AgentAnalysis | null;
   error: string | null;
 }
@@ -0,0 +1,16 @@
+import { HistoricalPrice, HistoricalPriceColumns } from '../types';
+
+/**
+ * Convert column-wise price history from the API into per-day rows
+ */
+export function toPriceRows(columns: HistoricalPriceColumns | undefined): HistoricalPrice[] {
+  const dates = columns?.date ?? [];
+  return dates.map((date, i) => ({
+    date,
+    open: columns!.open[i],
+    high: columns!.high[i],
+    low: columns!.low[i],
+    close: columns!.close[i],
+    volume: columns!.volume[i],
+  }));
+}